@@ -0,0 +1,71 @@
+import argparse
+import os
+import random
+import time
+
+from block_markdown import markdown_to_html, markdown_to_html_many
+from corpus import CorpusConfig, generate_corpus
+
+DOCUMENTS = 1_000_000
+DISTINCT = 20_000
+DOCUMENT_SIZE = 160
+
+
+def short_documents(count: int, distinct: int, size: int, seed: int = 0) -> list[str]:
+    config = CorpusConfig(seed=seed, pages=min(count, distinct), page_size=size)
+    pool = generate_corpus(config)
+    rng = random.Random(seed)
+    return [rng.choice(pool) for _ in range(count)]
+
+
+def render_loop(documents: list[str]) -> list[str]:
+    return [
+        "".join(node.to_html() for node in markdown_to_html(markdown))
+        for markdown in documents
+    ]
+
+
+def timed(label: str, render, documents: list[str]) -> list[str]:
+    start = time.perf_counter()
+    rendered = render(documents)
+    seconds = time.perf_counter() - start
+    print(
+        f"  {label:<28} {seconds:8.2f} s  {len(documents) / seconds:10.0f} docs/s"
+    )
+    return rendered
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare markdown_to_html_many with a markdown_to_html loop."
+    )
+    parser.add_argument("--documents", type=int, default=DOCUMENTS)
+    parser.add_argument("--distinct", type=int, default=DISTINCT)
+    parser.add_argument("--size", type=int, default=DOCUMENT_SIZE)
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    documents = short_documents(args.documents, args.distinct, args.size)
+    print(
+        f"{len(documents)} documents of ~{args.size} chars, "
+        f"{args.distinct} distinct"
+    )
+    expected = timed("markdown_to_html loop", render_loop, documents)
+    batched = timed("markdown_to_html_many", markdown_to_html_many, documents)
+    uncached = timed(
+        "  without block cache",
+        lambda documents: markdown_to_html_many(documents, block_cache_entries=0),
+        documents,
+    )
+    assert batched == expected and uncached == expected
+    if args.jobs > 1:
+        parallel = timed(
+            f"  with {args.jobs} processes",
+            lambda documents: markdown_to_html_many(documents, jobs=args.jobs),
+            documents,
+        )
+        assert parallel == expected
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import re
+import timeit
+
+from block_markdown import (
+    BlockType,
+    block_to_block_type,
+    block_to_html,
+    code_regex,
+    heading_regex,
+    quote_regex,
+    unordered_list_regex,
+)
+
+ITEMS = 10_000
+
+
+def block_to_block_type_regex(block: str) -> BlockType:
+    # The classifier used before first-character dispatch.
+    if re.match(heading_regex, block):
+        return BlockType.HEADING
+    if re.match(code_regex, block):
+        return BlockType.CODE
+    is_quote = is_unordered_list = is_ordered_list = True
+    for index, line in enumerate(block.splitlines()):
+        is_quote = is_quote and re.match(quote_regex, line) is not None
+        is_unordered_list = (
+            is_unordered_list and re.match(unordered_list_regex, line) is not None
+        )
+        is_ordered_list = (
+            is_ordered_list and re.match(rf"^{index+1}\. .*", line) is not None
+        )
+        if not (is_quote or is_unordered_list or is_ordered_list):
+            return BlockType.PARAGRAPH
+    if is_quote:
+        return BlockType.QUOTE
+    if is_unordered_list:
+        return BlockType.UNORDERED_LIST
+    if is_ordered_list:
+        return BlockType.ORDERED_LIST
+    return BlockType.PARAGRAPH
+
+
+def list_blocks(items: int) -> dict[str, str]:
+    return {
+        "unordered list": "\n".join(f"- item {index}" for index in range(items)),
+        "ordered list": "\n".join(f"{index}. item" for index in range(1, items + 1)),
+        "quote": "\n".join(f"> line {index}" for index in range(items)),
+        "paragraph": "\n".join(f"line {index}" for index in range(items)),
+    }
+
+
+def main(items: int = ITEMS, repeat: int = 5):
+    print(f"{items}-line blocks, best of {repeat}")
+    for name, block in list_blocks(items).items():
+        if block_to_block_type(block) != block_to_block_type_regex(block):
+            raise AssertionError(f"classifiers disagree on the {name} block")
+        baseline = min(
+            timeit.repeat(
+                lambda: block_to_block_type_regex(block), number=1, repeat=repeat
+            )
+        )
+        classify = min(
+            timeit.repeat(lambda: block_to_block_type(block), number=1, repeat=repeat)
+        )
+        parse = min(timeit.repeat(lambda: block_to_html(block), number=1, repeat=repeat))
+        print(
+            f"  {name:<15} regex {baseline * 1000:8.2f} ms"
+            f"   block_to_block_type {classify * 1000:8.2f} ms"
+            f"   block_to_html {parse * 1000:8.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
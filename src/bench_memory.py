@@ -0,0 +1,59 @@
+import sys
+import tracemalloc
+
+from block_markdown import (
+    BlockType,
+    block_to_block_type,
+    markdown_to_blocks,
+    markdown_to_html,
+)
+from corpus import CorpusConfig, generate_corpus
+from htmlnode import HTMLNode
+from inline_markdown import text_to_textnodes
+from leafnode import LeafNode
+from page_report import count_nodes
+from parentnode import ParentNode
+from textnode import TextNode, TextType
+
+
+def shallow_size(obj: object) -> int:
+    size = sys.getsizeof(obj)
+    if hasattr(obj, "__dict__"):
+        size += sys.getsizeof(obj.__dict__)
+    return size
+
+
+def main(pages: int = 200, page_size: int = 8192, seed: int = 0):
+    site = generate_corpus(CorpusConfig(seed=seed, pages=pages, page_size=page_size))
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    trees = [markdown_to_html(page) for page in site]
+    html_bytes = tracemalloc.get_traced_memory()[0] - before
+    html_nodes = sum(count_nodes(tree) for tree in trees)
+    del trees
+
+    paragraphs = [
+        block
+        for page in site
+        for block in markdown_to_blocks(page)
+        if block_to_block_type(block) == BlockType.PARAGRAPH
+    ]
+    before = tracemalloc.get_traced_memory()[0]
+    text_nodes = [text_to_textnodes(paragraph) for paragraph in paragraphs]
+    text_bytes = tracemalloc.get_traced_memory()[0] - before
+    text_count = sum(len(nodes) for nodes in text_nodes)
+    tracemalloc.stop()
+
+    print(f"pages: {pages}, bytes per page: {page_size}")
+    print(f"HTMLNode trees: {html_nodes} nodes, {html_bytes / html_nodes:.1f} bytes/node")
+    print(f"TextNode lists: {text_count} nodes, {text_bytes / text_count:.1f} bytes/node")
+    print("shallow instance size (object + __dict__):")
+    print(f"  HTMLNode   {shallow_size(HTMLNode('p', 'v'))}")
+    print(f"  LeafNode   {shallow_size(LeafNode('v', 'b'))}")
+    print(f"  ParentNode {shallow_size(ParentNode('p', []))}")
+    print(f"  TextNode   {shallow_size(TextNode('v', TextType.TEXT))}")
+
+
+if __name__ == "__main__":
+    main()
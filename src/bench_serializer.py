@@ -0,0 +1,81 @@
+import io
+import sys
+import timeit
+
+from block_markdown import markdown_to_html
+from corpus import CorpusConfig, generate_corpus
+from htmlnode import HTMLNode, TextStream
+from leafnode import LeafNode
+from parentnode import ParentNode
+from tags import tag_fragments
+
+DEPTHS = (10, 100, 900, 10_000, 100_000)
+
+
+def write_html_recursive(node: HTMLNode, stream: TextStream):
+    # The serializer ParentNode used before it switched to an explicit stack.
+    if not isinstance(node, ParentNode):
+        node.write_html(stream)
+        return
+    if node.tag is None:
+        raise ValueError("Parent Node needs a tag to be parsed.")
+    if node.children is None:
+        raise ValueError("Parent Node needs children to be parsed.")
+    fragments = tag_fragments.get(node.tag)
+    if fragments is None:
+        stream.write(f"<{node.tag}{node.props_to_html()}>")
+    elif node.props:
+        stream.write(fragments.open_start)
+        stream.write(node.props_to_html())
+        stream.write(">")
+    else:
+        stream.write(fragments.open)
+    for child in node.children:
+        write_html_recursive(child, stream)
+    stream.write(f"</{node.tag}>" if fragments is None else fragments.close)
+
+
+def nested_list(depth: int) -> HTMLNode:
+    node: HTMLNode = LeafNode("deepest item")
+    for level in range(depth):
+        tag = "ul" if level % 2 else "ol"
+        node = ParentNode(tag, [ParentNode("li", [LeafNode(f"item {level}"), node])])
+    return node
+
+
+def serialize(write, nodes: list[HTMLNode]) -> str:
+    stream = io.StringIO()
+    for node in nodes:
+        write(node, stream)
+    return stream.getvalue()
+
+
+def best_of(write, nodes: list[HTMLNode], repeat: int) -> float:
+    return min(timeit.repeat(lambda: serialize(write, nodes), number=1, repeat=repeat))
+
+
+def compare(label: str, nodes: list[HTMLNode], repeat: int):
+    iterative = best_of(ParentNode.write_html, nodes, repeat)
+    try:
+        recursive = best_of(write_html_recursive, nodes, repeat)
+        # Nested lists add two frames per level to the recursive version.
+        assert serialize(write_html_recursive, nodes) == serialize(
+            ParentNode.write_html, nodes
+        )
+        recursive_text = f"{recursive * 1000:9.2f} ms"
+    except RecursionError:
+        recursive_text = "RecursionError"
+    print(f"  {label:<22} iterative {iterative * 1000:9.2f} ms   recursive {recursive_text}")
+
+
+def main(repeat: int = 7):
+    print(f"best of {repeat}, recursion limit {sys.getrecursionlimit()}")
+    for depth in DEPTHS:
+        compare(f"nested lists x{depth}", [nested_list(depth)], repeat)
+    page = generate_corpus(CorpusConfig(pages=1, page_size=2 * 1024**2))[0]
+    blocks = [node for node in markdown_to_html(page) if isinstance(node, ParentNode)]
+    compare("2MB generated page", blocks, repeat)
+
+
+if __name__ == "__main__":
+    main()
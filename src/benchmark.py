@@ -0,0 +1,212 @@
+import argparse
+import json
+import platform
+import sys
+import time
+from collections.abc import Callable, Sequence
+from pathlib import Path
+
+from block_markdown import (
+    BlockType,
+    block_to_block_type,
+    markdown_to_blocks,
+    markdown_to_html,
+)
+from corpus import CorpusConfig, generate_corpus
+from inline_markdown import text_to_textnodes
+from sizes import parse_size
+
+PHASES = (
+    "markdown_to_blocks",
+    "block_to_block_type",
+    "text_to_textnodes",
+    "markdown_to_html",
+    "to_html",
+)
+DEFAULT_CASES = "1KB:200,64KB:20,1MB:2"
+DEFAULT_OUTPUT = Path("bench_output.txt")
+
+
+def parse_cases(text: str) -> list[tuple[int, int]]:
+    cases = []
+    for case in text.split(","):
+        size, _, pages = case.partition(":")
+        cases.append((parse_size(size), int(pages or 1)))
+    return cases
+
+
+def parse_block_mix(text: str) -> dict[str, float]:
+    mix = {}
+    for item in text.split(","):
+        kind, _, weight = item.partition("=")
+        BlockType(kind)
+        mix[kind] = float(weight or 1)
+    return mix
+
+
+def best_time(function: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_case(config: CorpusConfig, repeat: int) -> dict[str, float]:
+    documents = generate_corpus(config)
+    blocks = [block for document in documents for block in markdown_to_blocks(document)]
+    paragraphs = [
+        block for block in blocks if block_to_block_type(block) == BlockType.PARAGRAPH
+    ]
+    trees = [markdown_to_html(document) for document in documents]
+    return {
+        "markdown_to_blocks": best_time(
+            lambda: [markdown_to_blocks(document) for document in documents], repeat
+        ),
+        "block_to_block_type": best_time(
+            lambda: [block_to_block_type(block) for block in blocks], repeat
+        ),
+        "text_to_textnodes": best_time(
+            lambda: [text_to_textnodes(paragraph) for paragraph in paragraphs], repeat
+        ),
+        "markdown_to_html": best_time(
+            lambda: [markdown_to_html(document) for document in documents], repeat
+        ),
+        "to_html": best_time(
+            lambda: [node.to_html() for tree in trees for node in tree], repeat
+        ),
+    }
+
+
+def run_benchmarks(
+    cases: Sequence[tuple[int, int]], base_config: CorpusConfig, repeat: int
+) -> dict:
+    results = []
+    for size, pages in cases:
+        config = CorpusConfig(
+            seed=base_config.seed,
+            pages=pages,
+            page_size=size,
+            block_mix=base_config.block_mix,
+            inline_density=base_config.inline_density,
+            list_length=base_config.list_length,
+        )
+        name = f"{size}B x {pages}"
+        for phase, seconds in run_case(config, repeat).items():
+            results.append(
+                {
+                    "case": name,
+                    "phase": phase,
+                    "seconds": seconds,
+                    "bytes": size * pages,
+                }
+            )
+    return {
+        "python": platform.python_version(),
+        "seed": base_config.seed,
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def compare_results(old: dict, new: dict, threshold: float) -> list[dict]:
+    baseline = {(result["case"], result["phase"]): result for result in old["results"]}
+    comparisons = []
+    for result in new["results"]:
+        previous = baseline.get((result["case"], result["phase"]))
+        if previous is None or previous["seconds"] <= 0:
+            continue
+        ratio = result["seconds"] / previous["seconds"]
+        comparisons.append(
+            {
+                "case": result["case"],
+                "phase": result["phase"],
+                "old": previous["seconds"],
+                "new": result["seconds"],
+                "ratio": ratio,
+                "regression": ratio > 1 + threshold,
+            }
+        )
+    return comparisons
+
+
+def format_results(data: dict) -> str:
+    lines = []
+    for result in data["results"]:
+        rate = result["bytes"] / result["seconds"] / 1024**2 if result["seconds"] else 0
+        lines.append(
+            f"{result['case']:<20} {result['phase']:<20} "
+            f"{result['seconds'] * 1000:10.2f} ms {rate:8.2f} MB/s"
+        )
+    return "\n".join(lines)
+
+
+def format_comparison(comparisons: Sequence[dict]) -> str:
+    lines = []
+    for item in comparisons:
+        flag = "  REGRESSION" if item["regression"] else ""
+        lines.append(
+            f"{item['case']:<20} {item['phase']:<20} "
+            f"{item['old'] * 1000:10.2f} -> {item['new'] * 1000:10.2f} ms "
+            f"({item['ratio']:.2f}x){flag}"
+        )
+    return "\n".join(lines)
+
+
+def parse_args(argv: Sequence[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the markdown pipeline.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run = subparsers.add_parser("run", help="time every phase on synthetic corpora")
+    run.add_argument(
+        "--cases",
+        default=DEFAULT_CASES,
+        help="comma separated SIZE:PAGES pairs, e.g. 1KB:100,100MB:1",
+    )
+    run.add_argument("--seed", type=int, default=0)
+    run.add_argument("--repeat", type=int, default=3)
+    run.add_argument("--inline-density", type=float, default=0.2)
+    run.add_argument("--list-length", type=int, default=5)
+    run.add_argument(
+        "--block-mix",
+        help="comma separated TYPE=WEIGHT pairs, e.g. paragraph=3,code=1",
+    )
+    run.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+
+    compare = subparsers.add_parser("compare", help="compare two benchmark runs")
+    compare.add_argument("old", type=Path)
+    compare.add_argument("new", type=Path)
+    compare.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="slowdown ratio above which a phase counts as a regression",
+    )
+    return parser.parse_args(argv or ["run"])
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    if args.command == "compare":
+        old = json.loads(args.old.read_text(encoding="utf-8"))
+        new = json.loads(args.new.read_text(encoding="utf-8"))
+        comparisons = compare_results(old, new, args.threshold)
+        print(format_comparison(comparisons))
+        return 1 if any(item["regression"] for item in comparisons) else 0
+
+    config = CorpusConfig(
+        seed=args.seed,
+        inline_density=args.inline_density,
+        list_length=args.list_length,
+    )
+    if args.block_mix:
+        config.block_mix = parse_block_mix(args.block_mix)
+    data = run_benchmarks(parse_cases(args.cases), config, args.repeat)
+    args.output.write_text(json.dumps(data, indent=1), encoding="utf-8")
+    print(format_results(data))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,56 @@
+from collections import OrderedDict
+
+from htmlnode import HTMLNode
+
+
+class BlockCache:
+    def __init__(self, max_entries: int = 4096, max_chars: int = 4 * 1024 * 1024):
+        if max_entries < 1 or max_chars < 1:
+            raise ValueError("Block cache needs room for at least one block.")
+        self.max_entries = max_entries
+        self.max_chars = max_chars
+        self.chars = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[str, HTMLNode] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, block: str) -> HTMLNode | None:
+        node = self._entries.get(block)
+        if node is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(block)
+        self.hits += 1
+        return node
+
+    def put(self, block: str, node: HTMLNode):
+        # Blocks longer than the whole budget would only flush the cache.
+        if len(block) > self.max_chars:
+            return
+        if block in self._entries:
+            self._entries.move_to_end(block)
+            self._entries[block] = node
+            return
+        self._entries[block] = node
+        self.chars += len(block)
+        while len(self._entries) > self.max_entries or self.chars > self.max_chars:
+            evicted, _ = self._entries.popitem(last=False)
+            self.chars -= len(evicted)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+        self.chars = 0
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "chars": self.chars,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
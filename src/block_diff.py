@@ -0,0 +1,51 @@
+from block_markdown import block_to_html, markdown_to_blocks
+
+
+class DocumentRenderer:
+    def __init__(self):
+        self.blocks: list[str] = []
+        self.fragments: list[str] = []
+        self.reused = 0
+        self.rendered = 0
+
+    def render(self, markdown: str) -> str:
+        blocks = list(markdown_to_blocks(markdown))
+        old_blocks = self.blocks
+        old_fragments = self.fragments
+
+        limit = min(len(blocks), len(old_blocks))
+        prefix = 0
+        while prefix < limit and blocks[prefix] == old_blocks[prefix]:
+            prefix += 1
+        suffix = 0
+        while (
+            suffix < limit - prefix
+            and blocks[-1 - suffix] == old_blocks[-1 - suffix]
+        ):
+            suffix += 1
+
+        # Blocks between the unchanged ends may still have moved, so reuse any
+        # fragment the old middle already rendered for the same text.
+        old_middle = dict(
+            zip(
+                old_blocks[prefix : len(old_blocks) - suffix],
+                old_fragments[prefix : len(old_fragments) - suffix],
+            )
+        )
+        middle = []
+        rendered = 0
+        for block in blocks[prefix : len(blocks) - suffix]:
+            fragment = old_middle.get(block)
+            if fragment is None:
+                fragment = block_to_html(block).to_html()
+                rendered += 1
+            middle.append(fragment)
+
+        fragments = old_fragments[:prefix] + middle
+        if suffix:
+            fragments += old_fragments[-suffix:]
+        self.blocks = blocks
+        self.fragments = fragments
+        self.rendered = rendered
+        self.reused = len(blocks) - rendered
+        return "".join(fragments)
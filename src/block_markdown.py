@@ -1,9 +1,16 @@
+import functools
+import io
+import itertools
 import re
-from collections.abc import Sequence
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
 from enum import Enum
 
-from htmlnode import HTMLNode
+import instrumentation
+from block_cache import BlockCache
+from htmlnode import HTMLNode, TextStream
 from inline_markdown import text_to_textnodes
+from lazyparentnode import LazyParentNode
 from leafnode import LeafNode
 from parentnode import ParentNode
 from textnode import text_nodes_to_html_nodes
@@ -13,6 +20,20 @@ code_regex = r"^```\s*?(\S[\s\S]*?)\n?```$"
 unordered_list_regex = r"^[-*] (.*)"
 quote_regex = r"^>\s?(.*)"
 
+heading_pattern = re.compile(heading_regex)
+code_pattern = re.compile(code_regex)
+unordered_list_pattern = re.compile(unordered_list_regex)
+quote_pattern = re.compile(quote_regex)
+unordered_list_markers = ("- ", "* ")
+heading_tags = ("", "h1", "h2", "h3", "h4", "h5", "h6")
+# Batches revisit blocks from far back in the input, so their cache gets a
+# larger character budget than BlockCache's default.
+batch_cache_chars = 64 * 1024**2
+
+# Nodes served from the cache are shared between every block with the same
+# text, so callers must not mutate them.
+block_cache: BlockCache | None = None
+
 
 class BlockType(Enum):
     PARAGRAPH = "paragraph"
@@ -23,70 +44,258 @@ class BlockType(Enum):
     ORDERED_LIST = "ordered_list"
 
 
-def markdown_to_html(markdown: str) -> Sequence[HTMLNode]:
-    return [block_to_html(block) for block in markdown_to_blocks(markdown)]
+def markdown_to_html(markdown: str, lazy: bool = False) -> Sequence[HTMLNode]:
+    profiler = instrumentation.profiler
+    if profiler is None:
+        return [block_to_html(block, lazy) for block in markdown_to_blocks(markdown)]
+    return profiler.call(
+        "markdown_to_html", profiled_markdown_to_html, markdown, profiler, lazy
+    )
+
+
+def profiled_markdown_to_html(
+    markdown: str, profiler: instrumentation.Profiler, lazy: bool = False
+) -> Sequence[HTMLNode]:
+    blocks = profiler.call("markdown_to_blocks", markdown_to_blocks, markdown)
+    return [block_to_html(block, lazy) for block in blocks]
+
+
+def markdown_to_html_many(
+    documents: Iterable[str],
+    jobs: int = 1,
+    chunksize: int = 16384,
+    block_cache_entries: int = 65536,
+) -> list[str]:
+    if jobs <= 1:
+        return render_documents(documents, block_cache_entries)
+    iterator = iter(documents)
+    chunks = iter(lambda: list(itertools.islice(iterator, chunksize)), [])
+    render = functools.partial(
+        render_documents, block_cache_entries=block_cache_entries
+    )
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return [html for chunk in executor.map(render, chunks) for html in chunk]
+
+
+def render_documents(
+    documents: Iterable[str], block_cache_entries: int = 65536
+) -> list[str]:
+    # Short documents repeat whole blocks ("Thanks!", shared snippets). The
+    # batch caches each block as an untagged leaf holding its serialized
+    # HTML, so a repeat skips both parsing and serializing.
+    cache = None
+    if block_cache_entries > 0:
+        cache = BlockCache(block_cache_entries, batch_cache_chars)
+    rendered = []
+    for markdown in documents:
+        nodes = []
+        for block in markdown_to_blocks(markdown):
+            node = cache.get(block) if cache is not None else None
+            if node is None:
+                node = parse_block(block)
+                if cache is not None:
+                    node = LeafNode(render_blocks([node]))
+                    cache.put(block, node)
+            nodes.append(node)
+        rendered.append(render_blocks(nodes))
+    return rendered
+
+
+def render_blocks(blocks: Sequence[HTMLNode]) -> str:
+    stream = io.StringIO()
+    if instrumentation.profiler is None:
+        write_blocks(blocks, stream)
+    else:
+        instrumentation.profiler.call("serialize", write_blocks, blocks, stream)
+    return stream.getvalue()
+
+
+def write_blocks(blocks: Sequence[HTMLNode], stream: TextStream):
+    for block in blocks:
+        block.write_html(stream)
 
 
 def markdown_to_blocks(markdown: str) -> Sequence[str]:
     return [block.strip() for block in markdown.split("\n\n") if len(block) >= 1]
 
 
-def block_to_html(block: str) -> HTMLNode:
-    block_type = block_to_block_type(block)
+def stream_markdown_to_html(lines: Iterable[str]) -> Iterator[HTMLNode]:
+    for block in stream_markdown_to_blocks(lines):
+        yield block_to_html(block)
+
+
+def stream_markdown_to_blocks(lines: Iterable[str]) -> Iterator[str]:
+    parts: list[str] = []
+    for line in lines:
+        if not line:
+            continue
+        start = 0
+        # A "\n\n" separator can straddle two chunks.
+        if parts and parts[-1].endswith("\n") and line.startswith("\n"):
+            parts[-1] = parts[-1][:-1]
+            yield from _join_block(parts)
+            parts = []
+            start = 1
+        while (index := line.find("\n\n", start)) != -1:
+            parts.append(line[start:index])
+            yield from _join_block(parts)
+            parts = []
+            start = index + 2
+        if start < len(line):
+            parts.append(line[start:])
+    yield from _join_block(parts)
+
+
+def _join_block(parts: list[str]) -> Iterator[str]:
+    block = "".join(parts)
+    if len(block) >= 1:
+        yield block.strip()
+
+
+def enable_block_cache(cache: BlockCache | None = None) -> BlockCache:
+    global block_cache
+    block_cache = cache if cache is not None else BlockCache()
+    return block_cache
+
+
+def disable_block_cache():
+    global block_cache
+    block_cache = None
+
+
+def block_to_html(block: str, lazy: bool = False) -> HTMLNode:
+    # Lazy nodes parse their inline markup on first use, so they are not
+    # interchangeable with the cached eager ones.
+    if block_cache is None or lazy:
+        return parse_block(block, lazy)
+    node = block_cache.get(block)
+    if node is None:
+        node = parse_block(block)
+        block_cache.put(block, node)
+    return node
+
+
+def parse_block(block: str, lazy: bool = False) -> HTMLNode:
+    profiler = instrumentation.profiler
+    if profiler is None:
+        return build_block(block_to_block_type(block), block, lazy)
+    block_type = profiler.call("block_to_block_type", block_to_block_type, block)
+    return profiler.call(
+        f"block_to_html[{block_type.value}]", build_block, block_type, block, lazy
+    )
+
+
+def build_block(block_type: BlockType, block: str, lazy: bool = False) -> HTMLNode:
     if block_type == BlockType.HEADING:
         return extract_heading_from_block(block)
     elif block_type == BlockType.QUOTE:
-        return extract_quotes_from_block(block)
+        return extract_quotes_from_block(block, lazy)
     elif block_type == BlockType.CODE:
         return extract_code_from_block(block)
     elif block_type == BlockType.UNORDERED_LIST:
-        return extract_unordered_list_from_block(block)
+        return extract_unordered_list_from_block(block, lazy)
     elif block_type == BlockType.ORDERED_LIST:
-        return extract_ordered_list_from_block(block)
-    return ParentNode("p", text_to_leaf_nodes(block))
+        return extract_ordered_list_from_block(block, lazy)
+    return inline_parent("p", block, lazy)
 
 
 def block_to_block_type(block: str) -> BlockType:
-    if re.match(heading_regex, block):
+    if not block:
+        # A block without lines passes every "all lines are quotes" check.
+        return BlockType.QUOTE
+    classify = block_classifiers.get(block[0])
+    if classify is None:
+        return BlockType.PARAGRAPH
+    return classify(block)
+
+
+def classify_heading(block: str) -> BlockType:
+    if heading_pattern.match(block):
         return BlockType.HEADING
-    if re.match(code_regex, block):
+    return BlockType.PARAGRAPH
+
+
+def classify_code(block: str) -> BlockType:
+    if code_pattern.match(block):
         return BlockType.CODE
-    if all(re.match(quote_regex, line) for line in block.splitlines()):
+    return BlockType.PARAGRAPH
+
+
+def classify_quote(block: str) -> BlockType:
+    if all(line.startswith(">") for line in block.splitlines()):
         return BlockType.QUOTE
-    if all(re.match(unordered_list_regex, line) for line in block.splitlines()):
+    return BlockType.PARAGRAPH
+
+
+def classify_unordered_list(block: str) -> BlockType:
+    if all(
+        line.startswith(unordered_list_markers) for line in block.splitlines()
+    ):
         return BlockType.UNORDERED_LIST
+    return BlockType.PARAGRAPH
+
+
+def classify_ordered_list(block: str) -> BlockType:
     if all(
-        re.match(rf"^{index+1}\. .*", line)
-        for index, line in enumerate(block.splitlines())
+        line.startswith(prefix)
+        for line, prefix in zip(block.splitlines(), ordered_list_prefixes())
     ):
         return BlockType.ORDERED_LIST
     return BlockType.PARAGRAPH
 
 
+def ordered_list_prefixes() -> Iterator[str]:
+    index = 1
+    while True:
+        yield f"{index}. "
+        index += 1
+
+
+# Every block type but paragraphs is decided by the block's first character,
+# so each block runs at most one full check.
+block_classifiers = {
+    "#": classify_heading,
+    "`": classify_code,
+    ">": classify_quote,
+    "-": classify_unordered_list,
+    "*": classify_unordered_list,
+    "1": classify_ordered_list,
+}
+
+
 def extract_heading_from_block(block: str) -> LeafNode:
-    matches = re.search(heading_regex, block)
+    matches = heading_pattern.match(block)
     if matches is None:
         raise ValueError("Invalid heading")
     number_sign_amount = len(matches.group(1))
     text = matches.group(2)
-    return LeafNode(text, f"h{number_sign_amount}")
+    return LeafNode(text, heading_tags[number_sign_amount])
 
 
-def extract_quotes_from_block(block: str) -> ParentNode:
+def extract_quotes_from_block(block: str, lazy: bool = False) -> ParentNode:
     quotes = block.splitlines()
-    children = []
+    texts = []
     for quote in quotes:
-        matches = re.search(quote_regex, quote)
+        matches = quote_pattern.match(quote)
         if matches is None:
             raise ValueError(f"Invalid quote: {quote}")
         if matches.group(1) == "":
             continue
-        children.extend(text_to_leaf_nodes(matches.group(1)))
-    return ParentNode("quoteblock", children)
+        texts.append(matches.group(1))
+    if lazy:
+        return LazyParentNode("quoteblock", functools.partial(quote_children, texts))
+    return ParentNode("quoteblock", quote_children(texts))
+
+
+def quote_children(texts: Sequence[str]) -> list[LeafNode]:
+    children: list[LeafNode] = []
+    for text in texts:
+        children.extend(text_to_leaf_nodes(text))
+    return children
 
 
 def extract_code_from_block(block: str) -> ParentNode:
-    matches = re.search(code_regex, block)
+    matches = code_pattern.match(block)
     if matches is None:
         raise ValueError("Invalid code")
     text = matches.group(1)
@@ -94,33 +303,48 @@ def extract_code_from_block(block: str) -> ParentNode:
     return ParentNode("pre", [code])
 
 
-def extract_unordered_list_from_block(block: str) -> ParentNode:
+def extract_unordered_list_from_block(block: str, lazy: bool = False) -> ParentNode:
     children: list[HTMLNode] = []
     for item in block.splitlines():
-        matches = re.search(unordered_list_regex, item)
+        matches = unordered_list_pattern.match(item)
         if matches is None:
             raise ValueError("Invalid unordered list")
         item_text = matches.group(1)
-        children.append(ParentNode("li", text_to_leaf_nodes(item_text)))
+        children.append(inline_parent("li", item_text, lazy))
     return ParentNode("ul", children)
 
 
-def extract_ordered_list_from_block(block: str) -> ParentNode:
+def extract_ordered_list_from_block(block: str, lazy: bool = False) -> ParentNode:
     children: list[HTMLNode] = []
-    for index, item in enumerate(block.splitlines()):
-        matches = re.search(rf"^{index+1}\. (.*)", item)
-        if matches is None:
+    for item, prefix in zip(block.splitlines(), ordered_list_prefixes()):
+        if not item.startswith(prefix):
             raise ValueError("Invalid ordered list")
-        item_text = matches.group(1)
-        children.append(ParentNode("li", text_to_leaf_nodes(item_text)))
+        item_text = item[len(prefix) :]
+        children.append(inline_parent("li", item_text, lazy))
 
     return ParentNode("ol", children)
 
 
+def inline_parent(tag: str, text: str, lazy: bool = False) -> ParentNode:
+    if lazy:
+        return LazyParentNode(tag, functools.partial(text_to_leaf_nodes, text))
+    return ParentNode(tag, text_to_leaf_nodes(text))
+
+
 def text_to_leaf_nodes(text: str) -> Sequence[LeafNode]:
     if text == "":
         return []
-    text_nodes = text_to_textnodes(text)
+    profiler = instrumentation.profiler
+    # The leaves copy every piece out of text anyway, so spans would only add
+    # an object per piece; the single-pass scanner is what saves the time.
+    if profiler is None:
+        text_nodes = text_to_textnodes(text, single_pass=True)
+    else:
+        text_nodes = profiler.call("text_to_textnodes", text_to_textnodes, text, True)
     if not text_nodes:
         raise ValueError("Something went wrong when trying to get text nodes")
-    return text_nodes_to_html_nodes(text_nodes)
+    if profiler is None:
+        return text_nodes_to_html_nodes(text_nodes)
+    return profiler.call(
+        "text_nodes_to_html_nodes", text_nodes_to_html_nodes, text_nodes
+    )
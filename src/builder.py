@@ -0,0 +1,508 @@
+import functools
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+import time
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import block_markdown
+import instrumentation
+from block_cache import BlockCache
+from block_markdown import (
+    block_to_html,
+    enable_block_cache,
+    heading_tags,
+    markdown_to_html,
+    render_blocks,
+)
+from flat_document import FlatDocument, markdown_to_flat
+from htmlnode import HTMLNode
+from manifest import (
+    MANIFEST_NAME,
+    BuildManifest,
+    hash_bytes,
+    hash_config,
+    hash_file,
+    manifest_path_for,
+)
+from mapped_source import mapped_markdown_to_blocks
+from output_cache import DEFAULT_MAX_BYTES, OutputCache, cache_key
+from output_writer import OutputWriter, replace_if_changed, write_if_changed
+from page_report import PageStats, count_nodes
+from template import Template, load_template
+
+PHASES = ("discover", "parse", "render", "write")
+# Bump whenever a parser or serializer change alters the generated HTML, so
+# incremental builds re-render every page.
+PARSER_VERSION = "1"
+# Larger sources are memory-mapped and parsed one block at a time.
+MAPPED_SOURCE_BYTES = 8 * 1024**2
+# Placeholders a page layout can use; fill_template supplies each of them.
+TEMPLATE_FIELDS = ("title", "content")
+
+
+@dataclass
+class BuildReport:
+    pages: int = 0
+    unchanged: int = 0
+    identical: int = 0
+    removed: int = 0
+    assets: int = 0
+    block_cache: dict[str, int] | None = None
+    output_cache: dict[str, int] | None = None
+    timings: dict[str, float] = field(default_factory=lambda: dict.fromkeys(PHASES, 0.0))
+    elapsed: float = 0.0
+    page_stats: list[PageStats] = field(default_factory=list)
+
+    def format(self) -> str:
+        lines = [
+            f"built {self.pages} pages ({self.unchanged} unchanged, "
+            f"{self.identical} identical, {self.removed} removed), "
+            f"copied {self.assets} assets"
+        ]
+        for phase in PHASES:
+            lines.append(f"  {phase:<9} {self.timings[phase]:.3f}s")
+        lines.append(f"  {'elapsed':<9} {self.elapsed:.3f}s")
+        if self.block_cache is not None:
+            lines.append(
+                "block cache: {hits} hits, {misses} misses, "
+                "{evictions} evictions".format(**self.block_cache)
+            )
+        if self.output_cache is not None:
+            lines.append(
+                "output cache: {hits} hits, {misses} misses, "
+                "{added} added".format(**self.output_cache)
+            )
+        return "\n".join(lines)
+
+
+@dataclass
+class RenderedPage:
+    html: bytes
+    stats: PageStats
+    # Hash of the exact bytes that were rendered, which may differ from what
+    # discover saw if the source changed in between.
+    source_hash: str
+    # Large pages are written to a spool file instead of held in memory.
+    spool: Path | None = None
+
+    @property
+    def output(self) -> bytes | Path:
+        return self.html if self.spool is None else self.spool
+
+
+def discover_pages(content_dir: Path) -> list[Path]:
+    pages = []
+    for directory, _, files in os.walk(content_dir):
+        relative = Path(directory).relative_to(content_dir)
+        pages.extend(relative / name for name in files if name.endswith(".md"))
+    return sorted(pages, key=lambda page: page.parts)
+
+
+def output_path_for(page: Path, output_dir: Path) -> Path:
+    return output_dir / page.with_suffix(".html")
+
+
+def build_dependencies(template: Template | None = None) -> dict[str, str]:
+    dependencies = {"config": hash_config({"parser": PARSER_VERSION})}
+    if template is not None:
+        dependencies["template"] = hash_bytes(template.source.encode("utf-8"))
+    return dependencies
+
+
+def page_cache_key(
+    page: Path, source_hash: str, dependencies: dict[str, str], template: Template | None
+) -> str:
+    if template is None:
+        return cache_key(source_hash, dependencies)
+    # Pages without a heading take their title from the file name.
+    return cache_key(source_hash, {**dependencies, "stem": page.stem})
+
+
+def page_title(blocks: Iterable[HTMLNode]) -> str | None:
+    return heading_title((block.tag, block.value) for block in blocks)
+
+
+def flat_page_title(document: FlatDocument) -> str | None:
+    return heading_title(
+        (document.tag(index), document.value(index)) for index in document.roots()
+    )
+
+
+def heading_title(blocks: Iterable[tuple[str | None, str | None]]) -> str | None:
+    # Headings parse into leaves that hold the heading text as written, which
+    # is the title scan_metadata picks: the first h1, else the first heading.
+    first = None
+    for tag, value in blocks:
+        if tag == "h1":
+            return value
+        if first is None and tag in heading_tags[1:]:
+            first = value
+    return first
+
+
+def fill_template(
+    template: Template, title: str | None, content: str, source: Path
+) -> str:
+    return template.render({**page_context(title, source), "content": content})
+
+
+def fill_spooled_template(
+    template: Template, title: str | None, content: Path, page: Path, source: Path
+) -> Path:
+    parts = template.render_around("content", page_context(title, source))
+    try:
+        with open(page, "wb") as stream, open(content, "rb") as body:
+            stream.write(parts[0].encode("utf-8"))
+            for part in parts[1:]:
+                body.seek(0)
+                shutil.copyfileobj(body, stream)
+                stream.write(part.encode("utf-8"))
+    except BaseException:
+        page.unlink(missing_ok=True)
+        raise
+    finally:
+        content.unlink()
+    return page
+
+
+def page_context(title: str | None, source: Path) -> dict[str, str]:
+    return {"title": title if title is not None else source.stem}
+
+
+def render_page_file(
+    source: Path,
+    template: Template | None = None,
+    flat: bool = False,
+    spool_dir: Path | None = None,
+) -> RenderedPage:
+    # Workers raise this too, so a failed build names the page at fault.
+    try:
+        return _render_page_file(source, template, flat, spool_dir)
+    except ValueError as error:
+        raise ValueError(f"{source}: {error}") from error
+
+
+def _render_page_file(
+    source: Path, template: Template | None, flat: bool, spool_dir: Path | None
+) -> RenderedPage:
+    size = os.stat(source).st_size
+    # Without somewhere to spool to, large pages are rendered in memory.
+    if size >= MAPPED_SOURCE_BYTES and spool_dir is not None:
+        return render_mapped_page_file(source, size, template, spool_dir)
+    start = time.perf_counter()
+    data = source.read_bytes()
+    # Decoded the way read_text would, newline translation included.
+    markdown = io.TextIOWrapper(io.BytesIO(data), encoding="utf-8").read()
+    if flat:
+        document = markdown_to_flat(markdown)
+        parsed = time.perf_counter()
+        if instrumentation.profiler is None:
+            content = document.to_html()
+        else:
+            content = instrumentation.profiler.call("serialize", document.to_html)
+    else:
+        blocks = markdown_to_html(markdown)
+        parsed = time.perf_counter()
+        content = render_blocks(blocks)
+    if template is not None:
+        title = flat_page_title(document) if flat else page_title(blocks)
+        content = fill_template(template, title, content, source)
+    html = content.encode("utf-8")
+    rendered = time.perf_counter()
+    if flat:
+        block_count, node_count = sum(1 for _ in document.roots()), len(document)
+    else:
+        block_count, node_count = len(blocks), count_nodes(blocks)
+    stats = PageStats(
+        source.as_posix(),
+        parsed - start,
+        rendered - parsed,
+        block_count,
+        node_count,
+        len(markdown),
+        len(html),
+    )
+    return RenderedPage(html, stats, hash_bytes(data))
+
+
+def render_mapped_page_file(
+    source: Path, size: int, template: Template | None, spool_dir: Path
+) -> RenderedPage:
+    digest = hashlib.sha256()
+    # Counting characters would mean decoding the file twice, so the size in
+    # bytes stands in for the source length.
+    stats = PageStats(source.as_posix(), 0.0, 0.0, 0, 0, size, 0)
+    # Only the title is kept from the headings; see heading_title.
+    title = None
+    has_h1 = False
+    # The page goes to disk block by block, so memory holds one block at a
+    # time however large the output is. Spools are created like any other
+    # output file, so they keep the usual permissions when moved into place.
+    name = hash_bytes(os.fsencode(source))
+    spool = spool_dir / f"{name}.body"
+    try:
+        with open(spool, "w", encoding="utf-8", newline="") as stream:
+            for block in mapped_markdown_to_blocks(source, digest):
+                start = time.perf_counter()
+                node = block_to_html(block)
+                parsed = time.perf_counter()
+                if instrumentation.profiler is None:
+                    node.write_html(stream)
+                else:
+                    instrumentation.profiler.call("serialize", node.write_html, stream)
+                stats.parse_seconds += parsed - start
+                stats.render_seconds += time.perf_counter() - parsed
+                stats.blocks += 1
+                stats.nodes += count_nodes([node])
+                if not has_h1 and node.tag in heading_tags[1:]:
+                    if title is None or node.tag == "h1":
+                        title, has_h1 = node.value, node.tag == "h1"
+        if template is not None:
+            start = time.perf_counter()
+            page = spool_dir / f"{name}.html"
+            spool = fill_spooled_template(template, title, spool, page, source)
+            stats.render_seconds += time.perf_counter() - start
+    except BaseException:
+        spool.unlink(missing_ok=True)
+        raise
+    stats.output_bytes = spool.stat().st_size
+    return RenderedPage(b"", stats, digest.hexdigest(), spool)
+
+
+def configure_block_cache(max_entries: int):
+    if max_entries > 0:
+        enable_block_cache(BlockCache(max_entries))
+
+
+def renders_serially(jobs: int, count: int) -> bool:
+    return jobs <= 1 or count <= 1
+
+
+def render_pages(
+    sources: Sequence[Path],
+    jobs: int = 1,
+    block_cache_entries: int = 0,
+    template: Template | None = None,
+    flat: bool = False,
+    block_cache: BlockCache | None = None,
+    spool_dir: Path | None = None,
+) -> Iterator[RenderedPage]:
+    # The template travels to the workers already compiled.
+    render = functools.partial(
+        render_page_file, template=template, flat=flat, spool_dir=spool_dir
+    )
+    if renders_serially(jobs, len(sources)):
+        # The serial path borrows the process-wide cache slot for the build
+        # only, so callers that hold their own cache get it back.
+        previous = block_markdown.block_cache
+        if block_cache is not None:
+            enable_block_cache(block_cache)
+        try:
+            yield from map(render, sources)
+        finally:
+            block_markdown.block_cache = previous
+        return
+    chunksize = max(1, len(sources) // (jobs * 4))
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=configure_block_cache,
+        initargs=(block_cache_entries,),
+    ) as executor:
+        yield from executor.map(render, sources, chunksize=chunksize)
+
+
+def copy_static(static_dir: Path, output_dir: Path) -> int:
+    # Nothing records which outputs came from static_dir, so files deleted
+    # there stay in output_dir until it is cleaned; the dev server removes
+    # the ones deleted while it watches.
+    copied = 0
+    for path in sorted(static_dir.rglob("*")):
+        if not path.is_file():
+            continue
+        target = output_dir / path.relative_to(static_dir)
+        if is_same_copy(path, target):
+            continue
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(path, target)
+        copied += 1
+    return copied
+
+
+def is_same_copy(source: Path, target: Path) -> bool:
+    try:
+        target_stat = target.stat()
+    except FileNotFoundError:
+        return False
+    source_stat = source.stat()
+    return (
+        source_stat.st_size == target_stat.st_size
+        and source_stat.st_mtime_ns == target_stat.st_mtime_ns
+    )
+
+
+def build_site(
+    content_dir: Path,
+    output_dir: Path,
+    static_dir: Path | None = None,
+    jobs: int = 1,
+    incremental: bool = True,
+    block_cache_entries: int = 0,
+    template_path: Path | None = None,
+    writers: int = 4,
+    cache_dir: Path | None = None,
+    cache_max_bytes: int = DEFAULT_MAX_BYTES,
+    flat: bool = False,
+) -> BuildReport:
+    if not content_dir.is_dir():
+        raise ValueError(f"Content directory not found: {content_dir}")
+    template = None
+    if template_path is not None:
+        if not template_path.is_file():
+            raise ValueError(f"Template not found: {template_path}")
+        template = load_template(template_path, TEMPLATE_FIELDS)
+    report = BuildReport()
+    timings = report.timings
+    build_start = time.perf_counter()
+
+    start = time.perf_counter()
+    pages = discover_pages(content_dir)
+    manifest_path = manifest_path_for(output_dir)
+    manifest = BuildManifest.load(manifest_path)
+    # Older builds kept the manifest inside the output, where it was deployed.
+    (output_dir / MANIFEST_NAME).unlink(missing_ok=True)
+    dependencies = build_dependencies(template)
+    stale = []
+    for page in pages:
+        source = page.as_posix()
+        path = content_dir / page
+        stat = os.stat(path)
+        if incremental and manifest.is_fresh(source, stat, dependencies, output_dir):
+            report.unchanged += 1
+            continue
+        source_hash = hash_file(path)
+        if incremental and manifest.matches_content(
+            source, source_hash, dependencies, output_dir
+        ):
+            manifest.record(
+                source, source_hash, manifest.entries[source].output, stat, dependencies
+            )
+            report.unchanged += 1
+            continue
+        stale.append((page, source_hash, stat))
+    timings["discover"] += time.perf_counter() - start
+
+    writer = OutputWriter(writers) if writers > 0 and stale else None
+
+    def emit(page: Path, source_hash: str, stat: os.stat_result, html: bytes | Path):
+        target = output_path_for(page, output_dir)
+        if isinstance(html, Path):
+            # Spooled pages are already on disk next to their target.
+            if not replace_if_changed(target, html):
+                report.identical += 1
+        elif writer is not None:
+            writer.submit(target, html)
+        elif not write_if_changed(target, html):
+            report.identical += 1
+        manifest.record(
+            page.as_posix(),
+            source_hash,
+            target.relative_to(output_dir).as_posix(),
+            stat,
+            dependencies,
+        )
+
+    output_cache = None
+    misses = stale
+    block_cache = None
+    spool_dir = None
+    rendered = None
+    try:
+        if cache_dir is not None:
+            start = time.perf_counter()
+            output_cache = OutputCache(cache_dir, cache_max_bytes)
+            misses = []
+            # Hits go to the writer as they are read, so memory holds at most
+            # its backlog of cached pages rather than all of them.
+            for page, source_hash, stat in stale:
+                key = page_cache_key(page, source_hash, dependencies, template)
+                html = output_cache.get(key)
+                if html is None:
+                    misses.append((page, source_hash, stat))
+                else:
+                    emit(page, source_hash, stat, html)
+            timings["write"] += time.perf_counter() - start
+
+        # With several jobs, parse and render are summed over the workers. The
+        # write phase only counts time the render loop spends waiting on writes.
+        sources = [content_dir / page for page, _, _ in misses]
+        if block_cache_entries > 0 and renders_serially(jobs, len(sources)):
+            block_cache = BlockCache(block_cache_entries)
+        if any(stat.st_size >= MAPPED_SOURCE_BYTES for _, _, stat in misses):
+            # Spools live in a private directory that the finally block
+            # removes, along with any left by pages a failed build never used.
+            output_dir.mkdir(parents=True, exist_ok=True)
+            spool_dir = Path(tempfile.mkdtemp(prefix=".spool-", dir=output_dir))
+        rendered = render_pages(
+            sources, jobs, block_cache_entries, template, flat, block_cache, spool_dir
+        )
+        for (page, _, stat), rendered_page in zip(misses, rendered):
+            html, page_stats = rendered_page.output, rendered_page.stats
+            source_hash = rendered_page.source_hash
+            page_stats.page = page.as_posix()
+            report.page_stats.append(page_stats)
+            timings["parse"] += page_stats.parse_seconds
+            timings["render"] += page_stats.render_seconds
+
+            start = time.perf_counter()
+            if output_cache is not None:
+                key = page_cache_key(page, source_hash, dependencies, template)
+                if isinstance(html, Path):
+                    output_cache.put_file(key, html)
+                else:
+                    output_cache.put(key, html)
+            emit(page, source_hash, stat, html)
+            timings["write"] += time.perf_counter() - start
+    finally:
+        if rendered is not None:
+            rendered.close()
+        if spool_dir is not None:
+            shutil.rmtree(spool_dir, ignore_errors=True)
+        if writer is not None:
+            start = time.perf_counter()
+            writer.close()
+            report.identical += writer.identical
+            timings["write"] += time.perf_counter() - start
+    report.pages = len(stale)
+    if block_cache is not None:
+        report.block_cache = block_cache.stats()
+    if output_cache is not None:
+        if output_cache.added:
+            start = time.perf_counter()
+            output_cache.prune()
+            timings["write"] += time.perf_counter() - start
+        report.output_cache = {
+            "hits": output_cache.hits,
+            "misses": output_cache.misses,
+            "added": output_cache.added,
+        }
+
+    start = time.perf_counter()
+    for entry in manifest.remove_missing({page.as_posix() for page in pages}):
+        (output_dir / entry.output).unlink(missing_ok=True)
+        report.removed += 1
+    if manifest.changed:
+        manifest.save(manifest_path)
+    timings["write"] += time.perf_counter() - start
+
+    if static_dir is not None and static_dir.is_dir():
+        start = time.perf_counter()
+        report.assets = copy_static(static_dir, output_dir)
+        timings["write"] += time.perf_counter() - start
+    report.elapsed = time.perf_counter() - build_start
+    return report
@@ -0,0 +1,98 @@
+import random
+from dataclasses import dataclass, field
+
+from block_markdown import BlockType
+
+WORDS = (
+    "static site generator markdown block inline node page build render parse "
+    "tree list quote heading code link image text fast cache stream output"
+).split()
+
+DEFAULT_BLOCK_MIX = {
+    BlockType.PARAGRAPH.value: 0.4,
+    BlockType.HEADING.value: 0.15,
+    BlockType.CODE.value: 0.05,
+    BlockType.QUOTE.value: 0.1,
+    BlockType.UNORDERED_LIST.value: 0.15,
+    BlockType.ORDERED_LIST.value: 0.15,
+}
+
+
+@dataclass
+class CorpusConfig:
+    seed: int = 0
+    pages: int = 10
+    page_size: int = 4096
+    block_mix: dict[str, float] = field(default_factory=lambda: dict(DEFAULT_BLOCK_MIX))
+    inline_density: float = 0.2
+    list_length: int = 5
+    sentence_words: int = 12
+
+
+def generate_corpus(config: CorpusConfig) -> list[str]:
+    rng = random.Random(config.seed)
+    return [generate_document(config, rng) for _ in range(config.pages)]
+
+
+def generate_document(config: CorpusConfig, rng: random.Random) -> str:
+    kinds = list(config.block_mix)
+    weights = list(config.block_mix.values())
+    blocks = []
+    size = 0
+    while size < config.page_size:
+        kind = rng.choices(kinds, weights)[0]
+        block = generate_block(kind, config, rng)
+        blocks.append(block)
+        size += len(block) + 2
+    return "\n\n".join(blocks)
+
+
+def generate_block(kind: str, config: CorpusConfig, rng: random.Random) -> str:
+    if kind == BlockType.HEADING.value:
+        return "#" * rng.randint(1, 6) + " " + plain_sentence(config, rng)
+    if kind == BlockType.CODE.value:
+        lines = (plain_sentence(config, rng) for _ in range(rng.randint(1, 6)))
+        return "```\n" + "\n".join(lines) + "\n```"
+    if kind == BlockType.QUOTE.value:
+        return "\n".join(
+            "> " + sentence(config, rng) for _ in range(rng.randint(1, 4))
+        )
+    if kind == BlockType.UNORDERED_LIST.value:
+        return "\n".join(
+            rng.choice("-*") + " " + sentence(config, rng)
+            for _ in range(config.list_length)
+        )
+    if kind == BlockType.ORDERED_LIST.value:
+        return "\n".join(
+            f"{index}. " + sentence(config, rng)
+            for index in range(1, config.list_length + 1)
+        )
+    if kind == BlockType.PARAGRAPH.value:
+        return " ".join(sentence(config, rng) for _ in range(rng.randint(1, 5)))
+    raise ValueError(f"Unknown block kind: {kind}")
+
+
+def plain_sentence(config: CorpusConfig, rng: random.Random) -> str:
+    return " ".join(rng.choices(WORDS, k=config.sentence_words))
+
+
+def sentence(config: CorpusConfig, rng: random.Random) -> str:
+    words = []
+    for word in rng.choices(WORDS, k=config.sentence_words):
+        if rng.random() < config.inline_density:
+            word = inline_markup(word, rng)
+        words.append(word)
+    return " ".join(words) + "."
+
+
+def inline_markup(word: str, rng: random.Random) -> str:
+    markup = rng.randrange(5)
+    if markup == 0:
+        return f"**{word}**"
+    if markup == 1:
+        return f"*{word}*"
+    if markup == 2:
+        return f"`{word}`"
+    if markup == 3:
+        return f"[{word}](https://example.com/{word})"
+    return f"![{word}](https://example.com/{word}.png)"
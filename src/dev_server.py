@@ -0,0 +1,236 @@
+import functools
+import os
+import stat
+import sys
+import threading
+import time
+import urllib.parse
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from block_diff import DocumentRenderer
+from block_markdown import enable_block_cache
+from builder import (
+    TEMPLATE_FIELDS,
+    build_site,
+    copy_static,
+    fill_template,
+    output_path_for,
+)
+from metadata import scan_metadata_blocks
+from output_writer import write_atomic
+from template import Template, load_template
+
+Snapshot = dict[str, tuple[int, int]]
+
+
+@dataclass
+class WatchResult:
+    rendered: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    assets: int = 0
+    removed_assets: list[str] = field(default_factory=list)
+    seconds: float = 0.0
+
+    def __bool__(self) -> bool:
+        return bool(self.rendered or self.removed or self.assets or self.removed_assets)
+
+    def format(self) -> str:
+        return (
+            f"rebuilt {len(self.rendered)} pages, removed {len(self.removed)}, "
+            f"copied {self.assets} assets, removed {len(self.removed_assets)} assets "
+            f"in {self.seconds * 1000:.1f} ms"
+        )
+
+
+def scan_tree(root: Path, suffix: str = "") -> Snapshot:
+    snapshot: Snapshot = {}
+    if not root.is_dir():
+        return snapshot
+    pending = [str(root)]
+    prefix = len(str(root)) + 1
+    while pending:
+        with os.scandir(pending.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    pending.append(entry.path)
+                elif entry.name.endswith(suffix) and entry.is_file():
+                    entry_stat = entry.stat()
+                    relative = entry.path[prefix:].replace(os.sep, "/")
+                    snapshot[relative] = (entry_stat.st_mtime_ns, entry_stat.st_size)
+    return snapshot
+
+
+class SiteWatcher:
+    def __init__(
+        self,
+        content_dir: Path,
+        output_dir: Path,
+        static_dir: Path | None = None,
+        template_path: Path | None = None,
+    ):
+        self.content_dir = content_dir
+        self.output_dir = output_dir
+        self.static_dir = static_dir
+        self.template_path = template_path
+        self.pages = scan_tree(content_dir, ".md")
+        self.assets = self.scan_static()
+        self.template_signature = self.scan_template()
+        self.template = self.load_template()
+        # Only pages edited during the session keep their blocks in memory.
+        self.documents: dict[str, DocumentRenderer] = {}
+
+    def scan_template(self) -> tuple[int, int] | None:
+        if self.template_path is None:
+            return None
+        try:
+            template_stat = self.template_path.stat()
+        except OSError:
+            return None
+        return (template_stat.st_mtime_ns, template_stat.st_size)
+
+    def load_template(self) -> Template | None:
+        if self.template_path is None:
+            return None
+        return load_template(self.template_path, TEMPLATE_FIELDS)
+
+    def scan_static(self) -> Snapshot:
+        if self.static_dir is None:
+            return {}
+        return scan_tree(self.static_dir)
+
+    def poll(self) -> WatchResult:
+        start = time.perf_counter()
+        result = WatchResult()
+        template_signature = self.scan_template()
+        rerender = False
+        if template_signature != self.template_signature:
+            try:
+                self.template = self.load_template()
+            except (OSError, ValueError) as error:
+                print(f"error: {self.template_path}: {error}", file=sys.stderr)
+            else:
+                # A new layout touches every page. The old snapshot still
+                # decides which pages were deleted.
+                rerender = True
+            self.template_signature = template_signature
+        pages = scan_tree(self.content_dir, ".md")
+        for page, signature in pages.items():
+            if not rerender and self.pages.get(page) == signature:
+                continue
+            document = self.documents.get(page)
+            if document is None:
+                document = self.documents[page] = DocumentRenderer()
+            try:
+                markdown = (self.content_dir / page).read_text(encoding="utf-8")
+                content = document.render(markdown)
+                if self.template is not None:
+                    # The renderer already split the page, so only its
+                    # headings are scanned for the title.
+                    title = scan_metadata_blocks(document.blocks, 0).title
+                    content = fill_template(self.template, title, content, Path(page))
+                html = content.encode("utf-8")
+            except (OSError, ValueError) as error:
+                # Keep serving the last good output while the author types.
+                print(f"error: {page}: {error}", file=sys.stderr)
+                continue
+            write_atomic(output_path_for(Path(page), self.output_dir), html)
+            result.rendered.append(page)
+        for page in self.pages.keys() - pages.keys():
+            output_path_for(Path(page), self.output_dir).unlink(missing_ok=True)
+            self.documents.pop(page, None)
+            result.removed.append(page)
+        self.pages = pages
+
+        assets = self.scan_static()
+        if assets != self.assets and self.static_dir is not None:
+            result.assets = copy_static(self.static_dir, self.output_dir)
+            for asset in sorted(self.assets.keys() - assets.keys()):
+                (self.output_dir / asset).unlink(missing_ok=True)
+                result.removed_assets.append(asset)
+            self.assets = assets
+        result.seconds = time.perf_counter() - start
+        return result
+
+
+class SiteRequestHandler(SimpleHTTPRequestHandler):
+    etag: str | None = None
+
+    def send_head(self):
+        self.etag = None
+        path = self.translate_path(self.path)
+        if os.path.isdir(path):
+            # Directories without a trailing slash get redirected instead.
+            if not urllib.parse.urlsplit(self.path).path.endswith("/"):
+                return super().send_head()
+            path = os.path.join(path, "index.html")
+        try:
+            path_stat = os.stat(path)
+        except OSError:
+            return super().send_head()
+        if not stat.S_ISREG(path_stat.st_mode):
+            return super().send_head()
+        self.etag = f'"{path_stat.st_mtime_ns:x}-{path_stat.st_size:x}"'
+        if self.etag_matches(self.headers.get("If-None-Match")):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.end_headers()
+            return None
+        return super().send_head()
+
+    def etag_matches(self, header: str | None) -> bool:
+        if header is None:
+            return False
+        tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+        return "*" in tags or self.etag in tags
+
+    def end_headers(self):
+        if self.etag is not None:
+            self.send_header("ETag", self.etag)
+            self.send_header("Cache-Control", "no-cache")
+        super().end_headers()
+
+    def log_message(self, format: str, *args):
+        pass
+
+
+def make_server(output_dir: Path, host: str, port: int) -> ThreadingHTTPServer:
+    handler = functools.partial(SiteRequestHandler, directory=str(output_dir))
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def serve_site(
+    content_dir: Path,
+    output_dir: Path,
+    static_dir: Path | None,
+    template_path: Path | None = None,
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    watch: bool = False,
+    interval: float = 0.05,
+):
+    enable_block_cache()
+    report = build_site(
+        content_dir, output_dir, static_dir, template_path=template_path
+    )
+    print(report.format())
+    watcher = (
+        SiteWatcher(content_dir, output_dir, static_dir, template_path)
+        if watch
+        else None
+    )
+    server = make_server(output_dir, host, port)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    print(f"serving {output_dir} on http://{host}:{server.server_address[1]}/")
+    try:
+        while True:
+            time.sleep(interval)
+            if watcher is not None and (result := watcher.poll()):
+                print(result.format())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,376 @@
+import io
+import re
+from array import array
+from collections.abc import Iterator, Sequence
+from enum import IntEnum
+
+from block_markdown import (
+    BlockType,
+    block_to_block_type,
+    code_pattern,
+    heading_pattern,
+    heading_tags,
+    ordered_list_prefixes,
+    quote_pattern,
+    unordered_list_pattern,
+)
+from htmlnode import HTMLNode, TextStream
+from inline_markdown import scan_inline
+from leafnode import LeafNode
+from parentnode import ParentNode
+from tags import register_tag
+from textnode import TextType
+
+whitespace_pattern = re.compile(r"\s*")
+
+
+class NodeKind(IntEnum):
+    ELEMENT = 0
+    TEXT = 1
+    LEAF = 2
+    LINK = 3
+    IMAGE = 4
+
+
+# Tag ids index these lists; the open and close fragments come from the tag
+# registry, so serializing never formats a tag.
+tag_names: list[str] = []
+open_fragments: list[str] = []
+close_fragments: list[str] = []
+tag_ids: dict[str, int] = {}
+
+
+def tag_id(tag: str) -> int:
+    index = tag_ids.get(tag)
+    if index is None:
+        fragments = register_tag(tag)
+        index = tag_ids[tag] = len(tag_names)
+        tag_names.append(tag)
+        open_fragments.append(fragments.open)
+        close_fragments.append(fragments.close)
+    return index
+
+
+inline_nodes = {
+    TextType.BOLD: (NodeKind.LEAF, tag_id("b")),
+    TextType.ITALIC: (NodeKind.LEAF, tag_id("i")),
+    TextType.CODE: (NodeKind.LEAF, tag_id("code")),
+    TextType.LINK: (NodeKind.LINK, tag_id("a")),
+    TextType.IMAGE: (NodeKind.IMAGE, tag_id("img")),
+    TextType.TEXT: (NodeKind.TEXT, -1),
+}
+heading_ids = [-1] + [tag_id(tag) for tag in heading_tags[1:]]
+p_id, pre_id, code_id = tag_id("p"), tag_id("pre"), tag_id("code")
+quoteblock_id, ul_id, ol_id, li_id = (
+    tag_id("quoteblock"),
+    tag_id("ul"),
+    tag_id("ol"),
+    tag_id("li"),
+)
+
+
+class FlatDocument:
+    def __init__(self, text: str = ""):
+        # Nodes are stored in document order; every node's subtree ends where
+        # subtree_ends says, and all text lives in one buffer as offsets.
+        self.text = text
+        self.kinds = array("B")
+        self.tags = array("h")
+        self.starts = array("q")
+        self.ends = array("q")
+        self.url_starts = array("q")
+        self.url_ends = array("q")
+        self.parents = array("i")
+        self.subtree_ends = array("i")
+        # Attributes the node kinds do not imply, keyed by node index.
+        self.props: dict[int, dict[str, str]] = {}
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def add(
+        self,
+        kind: NodeKind,
+        tag: int,
+        start: int,
+        end: int,
+        parent: int,
+        url_start: int = -1,
+        url_end: int = -1,
+    ) -> int:
+        index = len(self.kinds)
+        self.kinds.append(kind)
+        self.tags.append(tag)
+        self.starts.append(start)
+        self.ends.append(end)
+        self.url_starts.append(url_start)
+        self.url_ends.append(url_end)
+        self.parents.append(parent)
+        self.subtree_ends.append(index + 1)
+        return index
+
+    def close(self, index: int):
+        self.subtree_ends[index] = len(self.kinds)
+
+    def children(self, index: int) -> Iterator[int]:
+        child = index + 1
+        end = self.subtree_ends[index] if index >= 0 else len(self.kinds)
+        while child < end:
+            yield child
+            child = self.subtree_ends[child]
+
+    def roots(self) -> Iterator[int]:
+        return self.children(-1)
+
+    def value(self, index: int) -> str:
+        return self.text[self.starts[index] : self.ends[index]]
+
+    def url(self, index: int) -> str | None:
+        if self.url_starts[index] < 0:
+            return None
+        return self.text[self.url_starts[index] : self.url_ends[index]]
+
+    def tag(self, index: int) -> str | None:
+        tag = self.tags[index]
+        return tag_names[tag] if tag >= 0 else None
+
+    def to_html(self) -> str:
+        stream = io.StringIO()
+        self.write_html(stream)
+        return stream.getvalue()
+
+    def write_html(self, stream: TextStream) -> None:
+        text, kinds, tags = self.text, self.kinds, self.tags
+        starts, ends, subtree_ends = self.starts, self.ends, self.subtree_ends
+        url_starts, url_ends, props = self.url_starts, self.url_ends, self.props
+        element, leaf, link = NodeKind.ELEMENT, NodeKind.LEAF, NodeKind.LINK
+        write = stream.write
+        closing: list[tuple[int, str]] = []
+        for index, kind in enumerate(kinds):
+            while closing and closing[-1][0] <= index:
+                write(closing.pop()[1])
+            if props and index in props:
+                self.write_with_props(stream, index)
+                if kind == element:
+                    closing.append((subtree_ends[index], close_fragments[tags[index]]))
+            elif kind == leaf:
+                tag = tags[index]
+                write(open_fragments[tag])
+                write(text[starts[index] : ends[index]])
+                write(close_fragments[tag])
+            elif kind == element:
+                tag = tags[index]
+                write(open_fragments[tag])
+                closing.append((subtree_ends[index], close_fragments[tag]))
+            elif kind == link:
+                write('<a href="')
+                write(text[url_starts[index] : url_ends[index]])
+                write('">')
+                write(text[starts[index] : ends[index]])
+                write("</a>")
+            elif kind == NodeKind.IMAGE:
+                write('<img src="')
+                write(text[url_starts[index] : url_ends[index]])
+                write('" alt="')
+                write(text[starts[index] : ends[index]])
+                write('"></img>')
+            else:
+                write(text[starts[index] : ends[index]])
+        while closing:
+            write(closing.pop()[1])
+
+    def write_with_props(self, stream: TextStream, index: int):
+        kind = self.kinds[index]
+        if kind == NodeKind.TEXT:
+            # Untagged leaves drop their attributes when serialized.
+            stream.write(self.value(index))
+            return
+        tag = tag_names[self.tags[index]]
+        attributes = "".join(
+            [f' {name}="{value}"' for name, value in self.props[index].items()]
+        )
+        stream.write(f"<{tag}{attributes}>")
+        if kind == NodeKind.LEAF:
+            stream.write(self.value(index))
+            stream.write(close_fragments[self.tags[index]])
+
+    def to_html_nodes(self) -> list[HTMLNode]:
+        roots: list[HTMLNode] = []
+        open_elements: list[tuple[int, list[HTMLNode]]] = []
+        for index, kind in enumerate(self.kinds):
+            while open_elements and open_elements[-1][0] <= index:
+                open_elements.pop()
+            siblings = open_elements[-1][1] if open_elements else roots
+            props = self.props.get(index)
+            if props is not None:
+                props = dict(props)
+            if kind == NodeKind.ELEMENT:
+                children: list[HTMLNode] = []
+                siblings.append(ParentNode(self.tag(index), children, props))
+                open_elements.append((self.subtree_ends[index], children))
+            elif kind == NodeKind.LINK:
+                siblings.append(
+                    LeafNode(self.value(index), "a", {"href": self.url(index)})
+                )
+            elif kind == NodeKind.IMAGE:
+                siblings.append(
+                    LeafNode(
+                        "", "img", {"src": self.url(index), "alt": self.value(index)}
+                    )
+                )
+            else:
+                siblings.append(LeafNode(self.value(index), self.tag(index), props))
+        return roots
+
+    @classmethod
+    def from_html_nodes(cls, nodes: Sequence[HTMLNode]) -> "FlatDocument":
+        document = cls()
+        parts: list[str] = []
+        length = 0
+
+        def store(text: str) -> tuple[int, int]:
+            nonlocal length
+            start = length
+            parts.append(text)
+            length += len(text)
+            return start, length
+
+        stack: list[tuple[Iterator[HTMLNode], int]] = [(iter(nodes), -1)]
+        while stack:
+            children, parent = stack[-1]
+            for node in children:
+                if isinstance(node, ParentNode):
+                    if node.tag is None:
+                        raise ValueError("Parent Node needs a tag to be parsed.")
+                    if node.children is None:
+                        raise ValueError("Parent Node needs children to be parsed.")
+                    index = document.add(
+                        NodeKind.ELEMENT, tag_id(node.tag), -1, -1, parent
+                    )
+                    if node.props:
+                        document.props[index] = dict(node.props)
+                    stack.append((iter(node.children), index))
+                    break
+                if not isinstance(node, LeafNode):
+                    raise ValueError(f"Cannot flatten {type(node).__name__}")
+                if node.value is None:
+                    raise ValueError("Leaf Node needs a value to be parsed.")
+                props = node.props
+                if node.tag == "a" and props and list(props) == ["href"]:
+                    url = store(props["href"])
+                    document.add(
+                        NodeKind.LINK, tag_id("a"), *store(node.value), parent, *url
+                    )
+                elif (
+                    node.tag == "img"
+                    and node.value == ""
+                    and props
+                    and list(props) == ["src", "alt"]
+                ):
+                    url = store(props["src"])
+                    document.add(
+                        NodeKind.IMAGE, tag_id("img"), *store(props["alt"]), parent, *url
+                    )
+                else:
+                    kind = NodeKind.TEXT if node.tag is None else NodeKind.LEAF
+                    tag = -1 if node.tag is None else tag_id(node.tag)
+                    index = document.add(kind, tag, *store(node.value), parent)
+                    if props:
+                        document.props[index] = dict(props)
+            else:
+                stack.pop()
+                if parent >= 0:
+                    document.close(parent)
+        document.text = "".join(parts)
+        return document
+
+
+def markdown_to_flat(markdown: str) -> FlatDocument:
+    document = FlatDocument(markdown)
+    position = 0
+    length = len(markdown)
+    # The same blocks as markdown_to_blocks, kept as offsets into markdown.
+    while True:
+        separator = markdown.find("\n\n", position)
+        raw_end = length if separator == -1 else separator
+        if raw_end > position:
+            start = whitespace_pattern.match(markdown, position, raw_end).end()
+            add_block(document, markdown[start:raw_end].rstrip(), start)
+        if separator == -1:
+            return document
+        position = separator + 2
+
+
+def add_block(document: FlatDocument, block: str, offset: int):
+    block_type = block_to_block_type(block)
+    if block_type == BlockType.HEADING:
+        matches = heading_pattern.match(block)
+        if matches is None:
+            raise ValueError("Invalid heading")
+        start, end = matches.span(2)
+        heading = heading_ids[len(matches.group(1))]
+        document.add(NodeKind.LEAF, heading, offset + start, offset + end, -1)
+    elif block_type == BlockType.QUOTE:
+        quote = document.add(NodeKind.ELEMENT, quoteblock_id, -1, -1, -1)
+        for line, line_start in line_spans(block, offset):
+            matches = quote_pattern.match(line)
+            if matches is None:
+                raise ValueError(f"Invalid quote: {line}")
+            start, end = matches.span(1)
+            add_inline(document, line_start + start, line_start + end, quote)
+        document.close(quote)
+    elif block_type == BlockType.CODE:
+        matches = code_pattern.match(block)
+        if matches is None:
+            raise ValueError("Invalid code")
+        start, end = matches.span(1)
+        pre = document.add(NodeKind.ELEMENT, pre_id, -1, -1, -1)
+        document.add(NodeKind.LEAF, code_id, offset + start, offset + end, pre)
+        document.close(pre)
+    elif block_type == BlockType.UNORDERED_LIST:
+        items = document.add(NodeKind.ELEMENT, ul_id, -1, -1, -1)
+        for line, line_start in line_spans(block, offset):
+            matches = unordered_list_pattern.match(line)
+            if matches is None:
+                raise ValueError("Invalid unordered list")
+            start, end = matches.span(1)
+            add_item(document, line_start + start, line_start + end, items)
+        document.close(items)
+    elif block_type == BlockType.ORDERED_LIST:
+        items = document.add(NodeKind.ELEMENT, ol_id, -1, -1, -1)
+        for (line, line_start), prefix in zip(
+            line_spans(block, offset), ordered_list_prefixes()
+        ):
+            if not line.startswith(prefix):
+                raise ValueError("Invalid ordered list")
+            add_item(document, line_start + len(prefix), line_start + len(line), items)
+        document.close(items)
+    else:
+        paragraph = document.add(NodeKind.ELEMENT, p_id, -1, -1, -1)
+        add_inline(document, offset, offset + len(block), paragraph)
+        document.close(paragraph)
+
+
+def line_spans(block: str, offset: int) -> Iterator[tuple[str, int]]:
+    position = 0
+    for line in block.splitlines():
+        yield line, offset + position
+        position += len(line)
+        position += 2 if block.startswith("\r\n", position) else 1
+
+
+def add_item(document: FlatDocument, start: int, end: int, parent: int):
+    item = document.add(NodeKind.ELEMENT, li_id, -1, -1, parent)
+    add_inline(document, start, end, item)
+    document.close(item)
+
+
+def add_inline(document: FlatDocument, start: int, end: int, parent: int):
+    if start == end:
+        return
+    spans = scan_inline(document.text, start, end)
+    if not spans:
+        raise ValueError("Something went wrong when trying to get text nodes")
+    for text_type, span_start, span_end, url_start, url_end in spans:
+        kind, tag = inline_nodes[text_type]
+        document.add(kind, tag, span_start, span_end, parent, url_start, url_end)
@@ -1,7 +1,15 @@
-from typing_extensions import Optional, Sequence
+import io
+
+from typing_extensions import Optional, Protocol, Sequence
+
+
+class TextStream(Protocol):
+    def write(self, text: str, /) -> object: ...
 
 
 class HTMLNode:
+    __slots__ = ("tag", "value", "children", "props")
+
     def __init__(
         self,
         tag: Optional[str] = None,
@@ -14,15 +22,18 @@ class HTMLNode:
         self.children = children
         self.props = props
 
-    def to_html(self):
+    def to_html(self) -> str:
+        stream = io.StringIO()
+        self.write_html(stream)
+        return stream.getvalue()
+
+    def write_html(self, stream: TextStream) -> None:
         raise NotImplementedError
 
     def props_to_html(self):
-        result = ""
-        if self.props is not None:
-            for prop in self.props:
-                result += f' {prop}="{self.props[prop]}"'
-        return result
+        if not self.props:
+            return ""
+        return "".join([f' {name}="{value}"' for name, value in self.props.items()])
 
     def __repr__(self) -> str:
         return f"HTMLNode({self.tag}, {self.value}, {self.children}, {self.props})"
@@ -1,8 +1,40 @@
 import re
-from textnode import TextNode, TextType
+from textnode import TextNode, TextSpan, TextType
 
+delimiter_pattern = re.compile(r"\*\*|\*|`")
+image_pattern = re.compile(r"\!\[(.*?)\]\((.*?)\)")
+link_pattern = re.compile(r"(?<!!)\[(.*?)\]\((.*?)\)")
 
-def text_to_textnodes(text: str) -> list[TextNode]:
+delimiter_text_types = {
+    "**": TextType.BOLD,
+    "*": TextType.ITALIC,
+    "`": TextType.CODE,
+}
+# Lower binds first: the pipeline splits on "**", then "*", then "`".
+delimiter_precedence = {"**": 0, "*": 1, "`": 2}
+
+# (text type, text start, text end, url start, url end), with the url
+# offsets set to -1 for nodes without a url.
+InlineSpan = tuple[TextType, int, int, int, int]
+
+
+def text_to_textnodes(
+    text: str, single_pass: bool = False, spans: bool = False
+) -> list[TextNode | TextSpan]:
+    if spans:
+        return [
+            TextSpan(text, start, end, text_type, url_start, url_end)
+            for text_type, start, end, url_start, url_end in scan_inline(text)
+        ]
+    if single_pass:
+        return [
+            TextNode(
+                text[start:end],
+                text_type,
+                text[url_start:url_end] if url_start >= 0 else None,
+            )
+            for text_type, start, end, url_start, url_end in scan_inline(text)
+        ]
     main_node = TextNode(text, TextType.TEXT)
     return split_nodes_link(
         split_nodes_image(
@@ -95,3 +127,52 @@ def extract_markdown_links(text: str) -> list[str]:
     link_regex = r"(?<!!)\[(.*?)\]\((.*?)\)"
     result = re.findall(link_regex, text)
     return result
+
+
+def scan_inline(text: str, start: int = 0, end: int | None = None) -> list[InlineSpan]:
+    # Offsets stay relative to the whole of text, so callers can scan part of
+    # a larger buffer without slicing it out first.
+    end = len(text) if end is None else end
+    spans: list[InlineSpan] = []
+    open_delimiter = None
+    section_start = start
+    for match in delimiter_pattern.finditer(text, start, end):
+        delimiter = match.group()
+        match_start, match_end = match.span()
+        if open_delimiter is None:
+            _scan_images(text, section_start, match_start, spans)
+            open_delimiter = delimiter
+            section_start = match_end
+        elif delimiter == open_delimiter:
+            if match_start > section_start:
+                spans.append(
+                    (delimiter_text_types[delimiter], section_start, match_start, -1, -1)
+                )
+            open_delimiter = None
+            section_start = match_end
+        elif delimiter_precedence[delimiter] < delimiter_precedence[open_delimiter]:
+            raise ValueError("Incorrectly formatted type.")
+    if open_delimiter is not None:
+        raise ValueError("Incorrectly formatted type.")
+    _scan_images(text, section_start, end, spans)
+    return spans
+
+
+def _scan_images(text: str, start: int, end: int, spans: list[InlineSpan]) -> None:
+    position = start
+    for match in image_pattern.finditer(text, start, end):
+        _scan_links(text, position, match.start(), spans)
+        spans.append((TextType.IMAGE, *match.span(1), *match.span(2)))
+        position = match.end()
+    _scan_links(text, position, end, spans)
+
+
+def _scan_links(text: str, start: int, end: int, spans: list[InlineSpan]) -> None:
+    position = start
+    for match in link_pattern.finditer(text, start, end):
+        if match.start() > position:
+            spans.append((TextType.TEXT, position, match.start(), -1, -1))
+        spans.append((TextType.LINK, *match.span(1), *match.span(2)))
+        position = match.end()
+    if end > position:
+        spans.append((TextType.TEXT, position, end, -1, -1))
@@ -0,0 +1,111 @@
+import json
+import sys
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from typing_extensions import TypeVar
+
+Result = TypeVar("Result")
+
+
+@dataclass
+class PhaseStats:
+    calls: int = 0
+    seconds: float = 0.0
+    self_seconds: float = 0.0
+    # Net change of sys.getallocatedblocks() while the phase ran.
+    allocations: int = 0
+
+    def add(self, other: "PhaseStats"):
+        self.calls += other.calls
+        self.seconds += other.seconds
+        self.self_seconds += other.self_seconds
+        self.allocations += other.allocations
+
+
+class Profiler:
+    def __init__(self):
+        self.stacks: dict[tuple[str, ...], PhaseStats] = {}
+        self._stack: list[str] = []
+        self._child_seconds: list[float] = []
+
+    def call(self, phase: str, function: Callable[..., Result], *args) -> Result:
+        self._stack.append(phase)
+        self._child_seconds.append(0.0)
+        blocks = sys.getallocatedblocks()
+        start = time.perf_counter()
+        try:
+            return function(*args)
+        finally:
+            elapsed = time.perf_counter() - start
+            allocations = sys.getallocatedblocks() - blocks
+            key = tuple(self._stack)
+            child_seconds = self._child_seconds.pop()
+            self._stack.pop()
+            if self._child_seconds:
+                self._child_seconds[-1] += elapsed
+            stats = self.stacks.get(key)
+            if stats is None:
+                stats = self.stacks[key] = PhaseStats()
+            stats.calls += 1
+            stats.seconds += elapsed
+            stats.self_seconds += elapsed - child_seconds
+            stats.allocations += allocations
+
+    def phases(self) -> dict[str, PhaseStats]:
+        totals: dict[str, PhaseStats] = {}
+        for stack, stats in self.stacks.items():
+            # Only the outermost frame of a phase counts, so recursion is not
+            # counted twice.
+            if stack[-1] in stack[:-1]:
+                continue
+            totals.setdefault(stack[-1], PhaseStats()).add(stats)
+        return totals
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "phases": {
+                    phase: asdict(stats)
+                    for phase, stats in sorted(self.phases().items())
+                },
+                "stacks": [
+                    {"stack": list(stack), **asdict(stats)}
+                    for stack, stats in self.stacks.items()
+                ],
+            },
+            indent=1,
+        )
+
+    def to_collapsed(self) -> str:
+        # One "frame;frame;frame microseconds" line per stack, as read by
+        # flamegraph.pl and speedscope.
+        return "".join(
+            f"{';'.join(stack)} {round(stats.self_seconds * 1_000_000)}\n"
+            for stack, stats in sorted(self.stacks.items())
+        )
+
+    def format(self) -> str:
+        lines = []
+        phases = sorted(self.phases().items(), key=lambda item: -item[1].seconds)
+        for phase, stats in phases:
+            lines.append(
+                f"  {phase:<32} {stats.calls:>9} calls {stats.seconds:9.3f}s "
+                f"(self {stats.self_seconds:.3f}s) {stats.allocations:>10} blocks"
+            )
+        return "\n".join(lines)
+
+
+profiler: Profiler | None = None
+
+
+def enable_profiler() -> Profiler:
+    global profiler
+    profiler = Profiler()
+    return profiler
+
+
+def disable_profiler() -> Profiler | None:
+    global profiler
+    previous, profiler = profiler, None
+    return previous
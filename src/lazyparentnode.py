@@ -0,0 +1,46 @@
+from collections.abc import Callable, Sequence
+from typing_extensions import Optional
+from htmlnode import HTMLNode
+from parentnode import ParentNode
+
+children_slot = HTMLNode.children
+
+
+class LazyParentNode(ParentNode):
+    __slots__ = ("load_children",)
+
+    def __init__(
+        self,
+        tag: str,
+        load_children: Callable[[], Sequence[HTMLNode]],
+        props: Optional[dict[str, str]] = None,
+    ):
+        super().__init__(tag, [], props)
+        self.load_children = load_children
+
+    @property
+    def children(self) -> Optional[Sequence[HTMLNode]]:
+        if self.load_children is not None:
+            children_slot.__set__(self, self.load_children())
+            self.load_children = None
+        return children_slot.__get__(self)
+
+    @children.setter
+    def children(self, children: Optional[Sequence[HTMLNode]]):
+        self.load_children = None
+        children_slot.__set__(self, children)
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.load_children is None
+
+    def __eq__(self, other) -> bool:
+        # Compares equal to the eager ParentNode it stands in for.
+        if not isinstance(other, ParentNode):
+            return False
+        return (
+            self.tag == other.tag
+            and self.value == other.value
+            and self.children == other.children
+            and self.props == other.props
+        )
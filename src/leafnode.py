@@ -1,8 +1,11 @@
-from htmlnode import HTMLNode
+from htmlnode import HTMLNode, TextStream
+from tags import tag_fragments
 from typing_extensions import Optional
 
 
 class LeafNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(
         self,
         value: str,
@@ -11,9 +14,21 @@ class LeafNode(HTMLNode):
     ):
         super().__init__(tag, value, None, props)
 
-    def to_html(self) -> str:
+    def write_html(self, stream: TextStream) -> None:
         if self.value is None:
             raise ValueError("Leaf Node needs a value to be parsed.")
         if self.tag is None:
-            return self.value
-        return f"<{self.tag}{self.props_to_html()}>{self.value}</{self.tag}>"
+            stream.write(self.value)
+            return
+        fragments = tag_fragments.get(self.tag)
+        if fragments is None:
+            stream.write(f"<{self.tag}{self.props_to_html()}>{self.value}</{self.tag}>")
+            return
+        if self.props:
+            stream.write(fragments.open_start)
+            stream.write(self.props_to_html())
+            stream.write(">")
+        else:
+            stream.write(fragments.open)
+        stream.write(self.value)
+        stream.write(fragments.close)
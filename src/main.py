@@ -0,0 +1,213 @@
+import argparse
+import sys
+from collections.abc import Sequence
+from pathlib import Path
+
+import instrumentation
+from builder import build_site
+from dev_server import serve_site
+from output_cache import DEFAULT_MAX_BYTES, OutputCache
+from page_report import find_slow_pages, format_page_report
+from sizes import parse_size
+
+
+def parse_args(argv: Sequence[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Build a static site from markdown.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build = subparsers.add_parser("build", help="render every page of the site")
+    build.add_argument("--content", type=Path, default=Path("content"))
+    build.add_argument("--output", type=Path, default=Path("public"))
+    build.add_argument("--static", type=Path, default=Path("static"))
+    build.add_argument(
+        "--template",
+        type=Path,
+        help="HTML layout with {{ title }} and {{ content }} placeholders",
+    )
+    build.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="number of worker processes used to render pages",
+    )
+    build.add_argument(
+        "--writers",
+        type=int,
+        default=4,
+        help="threads writing pages in the background (0 writes inline)",
+    )
+    build.add_argument(
+        "--cache",
+        type=Path,
+        metavar="DIR",
+        help="reuse HTML rendered by earlier builds from this directory",
+    )
+    build.add_argument(
+        "--cache-size",
+        type=parse_size,
+        default=DEFAULT_MAX_BYTES,
+        metavar="SIZE",
+        help="evict least recently used cache entries beyond SIZE (e.g. 256MB)",
+    )
+    build.add_argument(
+        "--flat",
+        action="store_true",
+        help="render through the array-backed document instead of node objects",
+    )
+    build.add_argument(
+        "--block-cache",
+        type=int,
+        default=0,
+        metavar="ENTRIES",
+        help="cache up to ENTRIES parsed blocks shared between pages",
+    )
+    build.add_argument(
+        "--report",
+        type=int,
+        default=0,
+        metavar="N",
+        help="list the N slowest pages with their sizes and node counts",
+    )
+    build.add_argument(
+        "--slow-ms",
+        type=float,
+        default=1000.0,
+        help="warn about pages whose parse and render take longer than this",
+    )
+    build.add_argument(
+        "--superlinear-factor",
+        type=float,
+        default=4.0,
+        help="warn about pages this many times slower per character than the median",
+    )
+    build.add_argument(
+        "--profile",
+        type=Path,
+        metavar="FILE",
+        help="write per-phase instrumentation as JSON (renders in-process)",
+    )
+    build.add_argument(
+        "--profile-stacks",
+        type=Path,
+        metavar="FILE",
+        help="write collapsed stacks for flame graphs (renders in-process)",
+    )
+    build.add_argument(
+        "--force",
+        action="store_true",
+        help="re-render every page instead of only the changed ones",
+    )
+
+    serve = subparsers.add_parser(
+        "serve", help="build the site and serve it over HTTP"
+    )
+    serve.add_argument("--content", type=Path, default=Path("content"))
+    serve.add_argument("--output", type=Path, default=Path("public"))
+    serve.add_argument("--static", type=Path, default=Path("static"))
+    serve.add_argument(
+        "--template",
+        type=Path,
+        help="HTML layout with {{ title }} and {{ content }} placeholders",
+    )
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8000)
+    serve.add_argument(
+        "--watch",
+        action="store_true",
+        help="re-render changed pages while serving",
+    )
+    serve.add_argument(
+        "--interval",
+        type=float,
+        default=0.05,
+        help="seconds between checks for changed files",
+    )
+
+    cache = subparsers.add_parser("cache", help="inspect the rendered output cache")
+    cache.add_argument("action", choices=("stats", "prune"))
+    cache.add_argument("--cache", type=Path, required=True, metavar="DIR")
+    cache.add_argument(
+        "--max-size",
+        type=parse_size,
+        default=DEFAULT_MAX_BYTES,
+        metavar="SIZE",
+        help="prune least recently used entries until the cache fits in SIZE",
+    )
+
+    return parser.parse_args(argv or ["build"])
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    if args.command == "build":
+        profiling = args.profile is not None or args.profile_stacks is not None
+        profiler = instrumentation.enable_profiler() if profiling else None
+        try:
+            report = build_site(
+                args.content,
+                args.output,
+                args.static,
+                # Worker processes would record into their own profilers.
+                jobs=1 if profiling else args.jobs,
+                incremental=not args.force,
+                block_cache_entries=args.block_cache,
+                template_path=args.template,
+                writers=args.writers,
+                cache_dir=args.cache,
+                cache_max_bytes=args.cache_size,
+                flat=args.flat,
+            )
+        except ValueError as error:
+            print(error, file=sys.stderr)
+            return 1
+        finally:
+            instrumentation.disable_profiler()
+        print(report.format())
+        if args.report > 0:
+            print(format_page_report(report.page_stats, args.report))
+        slow_pages = find_slow_pages(
+            report.page_stats, args.slow_ms / 1000, args.superlinear_factor
+        )
+        for slow_page in slow_pages:
+            print(
+                f"warning: slow page {slow_page.stats.page}: {slow_page.reason}",
+                file=sys.stderr,
+            )
+        if profiler is not None:
+            print(profiler.format())
+            if args.profile is not None:
+                args.profile.write_text(profiler.to_json(), encoding="utf-8")
+            if args.profile_stacks is not None:
+                args.profile_stacks.write_text(
+                    profiler.to_collapsed(), encoding="utf-8"
+                )
+    elif args.command == "serve":
+        if not args.content.is_dir():
+            print(f"Content directory not found: {args.content}", file=sys.stderr)
+            return 1
+        serve_site(
+            args.content,
+            args.output,
+            args.static,
+            args.template,
+            args.host,
+            args.port,
+            args.watch,
+            args.interval,
+        )
+    elif args.command == "cache":
+        cache = OutputCache(args.cache, args.max_size)
+        if args.action == "prune":
+            result = cache.prune()
+            print(f"removed {result.removed} entries, freed {result.freed} bytes")
+        stats = cache.stats()
+        print(
+            f"{stats['entries']} entries, {stats['bytes']} bytes "
+            f"(limit {stats['max_bytes']} bytes) in {args.cache}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+MANIFEST_NAME = ".build-manifest.json"
+MANIFEST_VERSION = 1
+
+
+def manifest_path_for(output_dir: Path) -> Path:
+    # The manifest sits beside the output so it is never published with it.
+    output_dir = output_dir.resolve()
+    return output_dir.parent / f".{output_dir.name}{MANIFEST_NAME}"
+
+
+def hash_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_file(path: Path, chunk_bytes: int = 1024**2) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        while chunk := file.read(chunk_bytes):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_config(config: dict[str, str]) -> str:
+    return hash_bytes(json.dumps(config, sort_keys=True).encode("utf-8"))
+
+
+@dataclass
+class ManifestEntry:
+    source_hash: str
+    output: str
+    size: int
+    mtime_ns: int
+    dependencies: dict[str, str]
+
+
+class BuildManifest:
+    def __init__(self, entries: dict[str, ManifestEntry] | None = None):
+        self.entries = entries if entries is not None else {}
+        self.changed = False
+
+    @classmethod
+    def load(cls, path: Path) -> "BuildManifest":
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return cls()
+        if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+            return cls()
+        try:
+            entries = {
+                source: ManifestEntry(**entry)
+                for source, entry in data["pages"].items()
+            }
+        except (KeyError, TypeError, AttributeError):
+            return cls()
+        return cls(entries)
+
+    def save(self, path: Path):
+        data = {
+            "version": MANIFEST_VERSION,
+            "pages": {
+                source: asdict(entry) for source, entry in sorted(self.entries.items())
+            },
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_name(path.name + ".tmp")
+        temporary.write_text(json.dumps(data, indent=1), encoding="utf-8")
+        os.replace(temporary, path)
+        self.changed = False
+
+    def is_fresh(
+        self,
+        source: str,
+        stat: os.stat_result,
+        dependencies: dict[str, str],
+        output_dir: Path,
+    ) -> bool:
+        entry = self.entries.get(source)
+        return (
+            entry is not None
+            and entry.size == stat.st_size
+            and entry.mtime_ns == stat.st_mtime_ns
+            and entry.dependencies == dependencies
+            and os.path.isfile(os.path.join(output_dir, entry.output))
+        )
+
+    def matches_content(
+        self,
+        source: str,
+        source_hash: str,
+        dependencies: dict[str, str],
+        output_dir: Path,
+    ) -> bool:
+        entry = self.entries.get(source)
+        return (
+            entry is not None
+            and entry.source_hash == source_hash
+            and entry.dependencies == dependencies
+            and (output_dir / entry.output).is_file()
+        )
+
+    def record(
+        self,
+        source: str,
+        source_hash: str,
+        output: str,
+        stat: os.stat_result,
+        dependencies: dict[str, str],
+    ):
+        entry = ManifestEntry(
+            source_hash, output, stat.st_size, stat.st_mtime_ns, dict(dependencies)
+        )
+        if self.entries.get(source) != entry:
+            self.entries[source] = entry
+            self.changed = True
+
+    def remove_missing(self, sources: set[str]) -> list[ManifestEntry]:
+        removed = [
+            self.entries.pop(source)
+            for source in list(self.entries)
+            if source not in sources
+        ]
+        if removed:
+            self.changed = True
+        return removed
@@ -0,0 +1,78 @@
+import io
+import mmap
+import os
+from collections.abc import Iterator
+from pathlib import Path
+
+from typing_extensions import Protocol
+
+from block_markdown import block_to_html, stream_markdown_to_blocks
+from htmlnode import HTMLNode
+
+# Pages already read are dropped from the mapping in steps of this size, so
+# resident memory tracks the block being parsed rather than the file.
+RELEASE_BYTES = 16 * 1024**2
+TEXT_CHUNK_CHARS = 64 * 1024
+
+
+class Digest(Protocol):
+    def update(self, data: bytes, /) -> None: ...
+
+
+def mapped_markdown_to_html(path: Path) -> Iterator[HTMLNode]:
+    for block in mapped_markdown_to_blocks(path):
+        yield block_to_html(block)
+
+
+def mapped_markdown_to_blocks(
+    path: Path, digest: Digest | None = None
+) -> Iterator[str]:
+    with open(path, "rb") as file:
+        size = os.fstat(file.fileno()).st_size
+        if size == 0:
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            start = 0
+            released = 0
+            while start < size:
+                index = mapped.find(b"\n\n", start)
+                end = size if index == -1 else index
+                if mapped.find(b"\r", start, end) != -1:
+                    # Text mode translates "\r\n" and "\r" into "\n", which
+                    # moves block boundaries. The rest of the file goes
+                    # through the text stream parser from this block on.
+                    if digest is not None:
+                        _update_digest(digest, mapped, start, size)
+                    file.seek(start)
+                    yield from _text_blocks(file)
+                    return
+                if digest is not None:
+                    digest.update(mapped[start : min(end + 2, size)])
+                if end > start:
+                    yield mapped[start:end].decode("utf-8").strip()
+                start = end + 2
+                if start - released >= RELEASE_BYTES:
+                    released = _release(mapped, released, start)
+
+
+def _text_blocks(file: io.BufferedReader) -> Iterator[str]:
+    text = io.TextIOWrapper(file, encoding="utf-8")
+    try:
+        yield from stream_markdown_to_blocks(
+            iter(lambda: text.read(TEXT_CHUNK_CHARS), "")
+        )
+    finally:
+        # The caller's with block owns the file.
+        text.detach()
+
+
+def _update_digest(digest: Digest, mapped: mmap.mmap, start: int, end: int):
+    for position in range(start, end, RELEASE_BYTES):
+        digest.update(mapped[position : min(position + RELEASE_BYTES, end)])
+
+
+def _release(mapped: mmap.mmap, released: int, position: int) -> int:
+    end = min(position, len(mapped)) // mmap.PAGESIZE * mmap.PAGESIZE
+    if end > released and hasattr(mmap, "MADV_DONTNEED"):
+        mapped.madvise(mmap.MADV_DONTNEED, released, end - released)
+    return end
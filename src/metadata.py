@@ -0,0 +1,69 @@
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from block_markdown import (
+    BlockType,
+    block_to_block_type,
+    heading_pattern,
+    stream_markdown_to_blocks,
+)
+from inline_markdown import delimiter_pattern, image_pattern, link_pattern
+
+
+@dataclass
+class PageMetadata:
+    title: str | None = None
+    headings: list[tuple[int, str]] = field(default_factory=list)
+    summary: str = ""
+
+
+def scan_metadata(lines: Iterable[str] | str, summary_chars: int = 200) -> PageMetadata:
+    if isinstance(lines, str):
+        lines = [lines]
+    return scan_metadata_blocks(stream_markdown_to_blocks(lines), summary_chars)
+
+
+def scan_metadata_blocks(blocks: Iterable[str], summary_chars: int = 200) -> PageMetadata:
+    metadata = PageMetadata()
+    summary: list[str] = []
+    summary_length = 0
+    for block in blocks:
+        if block.startswith("#"):
+            matches = heading_pattern.match(block)
+            if matches is not None:
+                metadata.headings.append((len(matches.group(1)), matches.group(2)))
+                continue
+        if summary_length < summary_chars and (
+            block_to_block_type(block) == BlockType.PARAGRAPH
+        ):
+            text = plain_text(block)
+            summary.append(text)
+            summary_length += len(text) + 1
+    metadata.title = next(
+        (text for level, text in metadata.headings if level == 1),
+        metadata.headings[0][1] if metadata.headings else None,
+    )
+    metadata.summary = truncate(" ".join(summary), summary_chars)
+    return metadata
+
+
+def scan_metadata_file(path: Path, summary_chars: int = 200) -> PageMetadata:
+    with path.open(encoding="utf-8") as file:
+        return scan_metadata(file, summary_chars)
+
+
+def plain_text(markdown: str) -> str:
+    text = image_pattern.sub(r"\1", markdown)
+    text = link_pattern.sub(r"\1", text)
+    text = delimiter_pattern.sub("", text)
+    return " ".join(text.split())
+
+
+def truncate(text: str, length: int) -> str:
+    if len(text) <= length:
+        return text
+    cut = text[:length]
+    # Prefer ending on a word boundary when there is one nearby.
+    space = length if text[length] == " " else cut.rfind(" ", length // 2)
+    return (cut[:space] if space != -1 else cut).rstrip() + "…"
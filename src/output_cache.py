@@ -0,0 +1,123 @@
+import os
+import shutil
+import tempfile
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+from typing_extensions import BinaryIO
+
+from manifest import hash_config
+
+DEFAULT_MAX_BYTES = 256 * 1024**2
+
+
+def cache_key(source_hash: str, dependencies: dict[str, str]) -> str:
+    return hash_config({"source": source_hash, **dependencies})
+
+
+@dataclass
+class CacheEntry:
+    path: Path
+    size: int
+    used_ns: int
+
+
+@dataclass
+class PruneResult:
+    removed: int = 0
+    freed: int = 0
+
+
+class OutputCache:
+    def __init__(self, directory: Path, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.added = 0
+
+    def path_for(self, key: str) -> Path:
+        return self.directory / key[:2] / key[2:]
+
+    def get(self, key: str) -> bytes | None:
+        path = self.path_for(key)
+        try:
+            data = path.read_bytes()
+            # The mtime doubles as the last-used time for LRU pruning.
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return data
+
+    def put(self, key: str, data: bytes):
+        self.store(key, lambda stream: stream.write(data))
+
+    def put_file(self, key: str, source: Path):
+        def copy(stream: BinaryIO):
+            with open(source, "rb") as file:
+                shutil.copyfileobj(file, stream)
+
+        self.store(key, copy)
+
+    def store(self, key: str, write: Callable[[BinaryIO], object]):
+        path = self.path_for(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Builds on other branches may share the directory, so every writer
+        # gets its own temporary file.
+        descriptor, temporary = tempfile.mkstemp(dir=path.parent, prefix=".")
+        try:
+            with os.fdopen(descriptor, "wb") as stream:
+                write(stream)
+            os.replace(temporary, path)
+        except BaseException:
+            Path(temporary).unlink(missing_ok=True)
+            raise
+        self.added += 1
+
+    def entries(self) -> list[CacheEntry]:
+        entries = []
+        if not self.directory.is_dir():
+            return entries
+        with os.scandir(self.directory) as shards:
+            for shard in shards:
+                if not shard.is_dir():
+                    continue
+                with os.scandir(shard.path) as files:
+                    for entry in files:
+                        if entry.name.startswith(".") or not entry.is_file():
+                            continue
+                        entry_stat = entry.stat()
+                        entries.append(
+                            CacheEntry(
+                                Path(entry.path), entry_stat.st_size, entry_stat.st_mtime_ns
+                            )
+                        )
+        return entries
+
+    def stats(self) -> dict[str, int]:
+        entries = self.entries()
+        return {
+            "entries": len(entries),
+            "bytes": sum(entry.size for entry in entries),
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "added": self.added,
+        }
+
+    def prune(self, max_bytes: int | None = None) -> PruneResult:
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        entries = self.entries()
+        total = sum(entry.size for entry in entries)
+        result = PruneResult()
+        for entry in sorted(entries, key=lambda entry: entry.used_ns):
+            if total <= limit:
+                break
+            entry.path.unlink(missing_ok=True)
+            total -= entry.size
+            result.removed += 1
+            result.freed += entry.size
+        return result
@@ -0,0 +1,101 @@
+import filecmp
+import os
+import shutil
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+
+
+def write_atomic(target: Path, data: bytes):
+    target.parent.mkdir(parents=True, exist_ok=True)
+    temporary = target.with_name(f".{target.name}.tmp")
+    temporary.write_bytes(data)
+    os.replace(temporary, target)
+
+
+def has_same_bytes(target: Path, data: bytes) -> bool:
+    try:
+        if os.stat(target).st_size != len(data):
+            return False
+        with open(target, "rb") as existing:
+            return existing.read() == data
+    except FileNotFoundError:
+        return False
+
+
+def write_if_changed(target: Path, data: bytes) -> bool:
+    # Leaving identical files alone keeps their mtimes stable for rsync and
+    # browser caches.
+    if has_same_bytes(target, data):
+        return False
+    write_atomic(target, data)
+    return True
+
+
+def replace_if_changed(target: Path, rendered: Path) -> bool:
+    # rendered is a finished output file; it is moved into place or deleted.
+    try:
+        same = filecmp.cmp(rendered, target, shallow=False)
+    except FileNotFoundError:
+        same = False
+    if same:
+        rendered.unlink()
+        return False
+    target.parent.mkdir(parents=True, exist_ok=True)
+    shutil.move(rendered, target)
+    return True
+
+
+class OutputWriter:
+    def __init__(self, workers: int = 4, max_pending: int = 64):
+        if workers < 1:
+            raise ValueError("OutputWriter needs at least one worker")
+        if max_pending < 1:
+            raise ValueError("max_pending must be positive")
+        self.executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="output-writer"
+        )
+        # Rendering blocks here once max_pending pages are waiting on disk.
+        self.slots = threading.BoundedSemaphore(max_pending)
+        self.lock = threading.Lock()
+        self.errors: list[BaseException] = []
+        self.written = 0
+        self.identical = 0
+
+    def submit(self, target: Path, data: bytes):
+        self.raise_errors()
+        self.slots.acquire()
+        try:
+            future = self.executor.submit(write_if_changed, target, data)
+        except BaseException:
+            self.slots.release()
+            raise
+        future.add_done_callback(self.finished)
+
+    def finished(self, future: Future):
+        self.slots.release()
+        with self.lock:
+            if future.exception() is not None:
+                self.errors.append(future.exception())
+            elif future.result():
+                self.written += 1
+            else:
+                self.identical += 1
+
+    def raise_errors(self):
+        with self.lock:
+            if self.errors:
+                raise self.errors[0]
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+        self.raise_errors()
+
+    def __enter__(self) -> "OutputWriter":
+        return self
+
+    def __exit__(self, *exc_info):
+        if exc_info[0] is None:
+            self.close()
+        else:
+            self.executor.shutdown(wait=True)
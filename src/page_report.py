@@ -0,0 +1,86 @@
+import statistics
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+
+from htmlnode import HTMLNode
+
+
+@dataclass
+class PageStats:
+    page: str
+    parse_seconds: float
+    render_seconds: float
+    blocks: int
+    nodes: int
+    source_chars: int
+    output_bytes: int
+
+    @property
+    def seconds(self) -> float:
+        return self.parse_seconds + self.render_seconds
+
+
+@dataclass
+class SlowPage:
+    stats: PageStats
+    reason: str
+
+
+def count_nodes(nodes: Iterable[HTMLNode]) -> int:
+    total = 0
+    stack = list(nodes)
+    while stack:
+        node = stack.pop()
+        total += 1
+        if node.children:
+            stack.extend(node.children)
+    return total
+
+
+def find_slow_pages(
+    pages: Sequence[PageStats],
+    threshold_seconds: float,
+    superlinear_factor: float = 4.0,
+    min_seconds: float = 0.005,
+) -> list[SlowPage]:
+    slow = []
+    rates = [page.seconds / max(page.source_chars, 1) for page in pages]
+    # A median needs a few pages before "slower than usual" means anything.
+    median_rate = statistics.median(rates) if len(rates) >= 3 else 0.0
+    for page, rate in zip(pages, rates):
+        if page.seconds > threshold_seconds:
+            slow.append(
+                SlowPage(
+                    page,
+                    f"took {page.seconds * 1000:.1f} ms "
+                    f"(threshold {threshold_seconds * 1000:.1f} ms)",
+                )
+            )
+        elif (
+            median_rate > 0
+            and page.seconds >= min_seconds
+            and rate > superlinear_factor * median_rate
+        ):
+            slow.append(
+                SlowPage(
+                    page,
+                    f"{rate / median_rate:.1f}x the median time per character "
+                    f"({page.source_chars} chars in {page.seconds * 1000:.1f} ms)",
+                )
+            )
+    return sorted(slow, key=lambda item: -item.stats.seconds)
+
+
+def format_page_report(pages: Sequence[PageStats], top: int) -> str:
+    lines = [
+        f"slowest {min(top, len(pages))} of {len(pages)} pages:",
+        f"  {'parse':>9} {'render':>9} {'blocks':>7} {'nodes':>8} "
+        f"{'source':>9} {'output':>9}  page",
+    ]
+    for page in sorted(pages, key=lambda page: -page.seconds)[:top]:
+        lines.append(
+            f"  {page.parse_seconds * 1000:7.1f}ms {page.render_seconds * 1000:7.1f}ms "
+            f"{page.blocks:>7} {page.nodes:>8} {page.source_chars:>9} "
+            f"{page.output_bytes:>9}  {page.page}"
+        )
+    return "\n".join(lines)
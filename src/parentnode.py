@@ -1,8 +1,12 @@
+from collections.abc import Iterator
 from typing_extensions import Optional, Sequence
-from htmlnode import HTMLNode
+from htmlnode import HTMLNode, TextStream
+from tags import tag_fragments
 
 
 class ParentNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(
         self,
         tag: str,
@@ -11,13 +15,38 @@ class ParentNode(HTMLNode):
     ):
         super().__init__(tag, None, children, props)
 
-    def to_html(self) -> str:
+    def write_html(self, stream: TextStream) -> None:
+        # An explicit stack of child iterators replaces recursion, so nesting
+        # depth is not bounded by the interpreter's recursion limit.
+        expand = ParentNode.write_html
+        stack = [self.write_open_tag(stream)]
+        while stack:
+            children, close = stack[-1]
+            for child in children:
+                # Leaves have no children, so only parents pay for the type
+                # check that keeps overridden serializers in charge.
+                if child.children is not None and type(child).write_html is expand:
+                    stack.append(child.write_open_tag(stream))
+                    break
+                child.write_html(stream)
+            else:
+                stack.pop()
+                stream.write(close)
+
+    def write_open_tag(self, stream: TextStream) -> tuple[Iterator[HTMLNode], str]:
         if self.tag is None:
             raise ValueError("Parent Node needs a tag to be parsed.")
-        if self.children is None:
+        children = self.children
+        if children is None:
             raise ValueError("Parent Node needs children to be parsed.")
-        result = f"<{self.tag}{self.props_to_html()}>"
-        for child in self.children:
-            result += f"{child.to_html()}"
-        result += f"</{self.tag}>"
-        return result
+        fragments = tag_fragments.get(self.tag)
+        if fragments is None:
+            stream.write(f"<{self.tag}{self.props_to_html()}>")
+            return iter(children), f"</{self.tag}>"
+        if self.props:
+            stream.write(fragments.open_start)
+            stream.write(self.props_to_html())
+            stream.write(">")
+        else:
+            stream.write(fragments.open)
+        return iter(children), fragments.close
@@ -0,0 +1,47 @@
+import sys
+
+from typing_extensions import NamedTuple
+
+DEFAULT_TAGS = (
+    "p",
+    "b",
+    "i",
+    "code",
+    "a",
+    "img",
+    "li",
+    "ul",
+    "ol",
+    "pre",
+    "h1",
+    "h2",
+    "h3",
+    "h4",
+    "h5",
+    "h6",
+    "quoteblock",
+)
+
+
+class TagFragments(NamedTuple):
+    open: str
+    open_start: str
+    close: str
+
+
+tag_fragments: dict[str, TagFragments] = {}
+
+
+def register_tag(tag: str) -> TagFragments:
+    fragments = tag_fragments.get(tag)
+    if fragments is None:
+        tag = sys.intern(tag)
+        fragments = TagFragments(
+            sys.intern(f"<{tag}>"), sys.intern(f"<{tag}"), sys.intern(f"</{tag}>")
+        )
+        tag_fragments[tag] = fragments
+    return fragments
+
+
+for default_tag in DEFAULT_TAGS:
+    register_tag(default_tag)
@@ -0,0 +1,73 @@
+import re
+from collections.abc import Collection, Mapping
+from pathlib import Path
+
+placeholder_pattern = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+
+
+class Template:
+    def __init__(self, source: str):
+        self.source = source
+        # Literals sit at even indexes and placeholder names at odd ones.
+        self.segments = placeholder_pattern.split(source)
+        self.slots = [
+            (index, self.segments[index]) for index in range(1, len(self.segments), 2)
+        ]
+
+    @property
+    def placeholders(self) -> set[str]:
+        return {name for _, name in self.slots}
+
+    def render(self, context: Mapping[str, str]) -> str:
+        parts = self.segments.copy()
+        for index, name in self.slots:
+            try:
+                parts[index] = context[name]
+            except KeyError:
+                raise ValueError(f"Template placeholder has no value: {name}")
+        return "".join(parts)
+
+    def render_around(self, name: str, context: Mapping[str, str]) -> list[str]:
+        # The text between the places name appears, for callers that write
+        # its value themselves.
+        parts: list[list[str]] = [[self.segments[0]]]
+        for index, slot in self.slots:
+            if slot == name:
+                parts.append([])
+            else:
+                try:
+                    parts[-1].append(context[slot])
+                except KeyError:
+                    raise ValueError(f"Template placeholder has no value: {slot}")
+            parts[-1].append(self.segments[index + 1])
+        return ["".join(part) for part in parts]
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Template):
+            return False
+        return self.source == other.source
+
+    def __repr__(self) -> str:
+        return f"Template({self.source!r})"
+
+
+# Only the latest version of each file is kept, keyed by its resolved path.
+template_cache: dict[str, tuple[int, int, Template]] = {}
+
+
+def load_template(path: Path, fields: Collection[str] | None = None) -> Template:
+    stat = path.stat()
+    key = str(path.resolve())
+    cached = template_cache.get(key)
+    if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        template = cached[2]
+    else:
+        template = Template(path.read_text(encoding="utf-8"))
+        template_cache[key] = (stat.st_mtime_ns, stat.st_size, template)
+    if fields is not None:
+        # Failing here stops a build before any page is rendered.
+        unknown = template.placeholders.difference(fields)
+        if unknown:
+            names = ", ".join(sorted(unknown))
+            raise ValueError(f"{path}: unknown template placeholders: {names}")
+    return template
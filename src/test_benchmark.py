@@ -0,0 +1,51 @@
+import unittest
+
+from benchmark import (
+    PHASES,
+    compare_results,
+    parse_block_mix,
+    parse_cases,
+    run_benchmarks,
+)
+from corpus import CorpusConfig
+
+
+class TestBenchmark(unittest.TestCase):
+    def test_parse_cases(self):
+        self.assertEqual(parse_cases("1KB:10,2MB"), [(1024, 10), (2 * 1024**2, 1)])
+
+    def test_parse_block_mix(self):
+        self.assertEqual(
+            parse_block_mix("paragraph=3,code"), {"paragraph": 3.0, "code": 1.0}
+        )
+        with self.assertRaises(ValueError):
+            parse_block_mix("table=1")
+
+    def test_run_benchmarks(self):
+        data = run_benchmarks([(512, 2)], CorpusConfig(), repeat=1)
+        self.assertEqual([result["phase"] for result in data["results"]], list(PHASES))
+        self.assertTrue(all(result["seconds"] >= 0 for result in data["results"]))
+
+    def test_compare_results(self):
+        old = {
+            "results": [
+                {"case": "c", "phase": "to_html", "seconds": 1.0},
+                {"case": "c", "phase": "markdown_to_html", "seconds": 1.0},
+            ]
+        }
+        new = {
+            "results": [
+                {"case": "c", "phase": "to_html", "seconds": 1.05},
+                {"case": "c", "phase": "markdown_to_html", "seconds": 1.5},
+                {"case": "d", "phase": "to_html", "seconds": 9.0},
+            ]
+        }
+        comparisons = compare_results(old, new, threshold=0.1)
+        self.assertEqual(
+            [(item["phase"], item["regression"]) for item in comparisons],
+            [("to_html", False), ("markdown_to_html", True)],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
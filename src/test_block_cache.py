@@ -0,0 +1,75 @@
+import unittest
+
+import block_markdown
+from block_cache import BlockCache
+from block_markdown import (
+    block_to_html,
+    disable_block_cache,
+    enable_block_cache,
+    markdown_to_html,
+)
+from leafnode import LeafNode
+
+
+class TestBlockCache(unittest.TestCase):
+    def test_get_and_put(self):
+        cache = BlockCache()
+        self.assertIsNone(cache.get("# heading"))
+        node = LeafNode("heading", "h1")
+        cache.put("# heading", node)
+        self.assertIs(cache.get("# heading"), node)
+        self.assertEqual(
+            cache.stats(),
+            {"entries": 1, "chars": 9, "hits": 1, "misses": 1, "evictions": 0},
+        )
+
+    def test_evicts_least_recently_used_entry(self):
+        cache = BlockCache(max_entries=2)
+        cache.put("a", LeafNode("a"))
+        cache.put("b", LeafNode("b"))
+        cache.get("a")
+        cache.put("c", LeafNode("c"))
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("a"))
+        self.assertEqual(cache.evictions, 1)
+
+    def test_evicts_by_size(self):
+        cache = BlockCache(max_chars=10)
+        cache.put("123456", LeafNode("first"))
+        cache.put("7890ab", LeafNode("second"))
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.chars, 6)
+        cache.put("x" * 11, LeafNode("too big"))
+        self.assertEqual(len(cache), 1)
+
+    def test_invalid_size(self):
+        with self.assertRaises(ValueError):
+            BlockCache(max_entries=0)
+
+
+class TestBlockToHtmlCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = enable_block_cache(BlockCache())
+
+    def tearDown(self):
+        disable_block_cache()
+
+    def test_enable_and_disable(self):
+        self.assertIs(block_markdown.block_cache, self.cache)
+        disable_block_cache()
+        self.assertIsNone(block_markdown.block_cache)
+
+    def test_repeated_blocks_hit_the_cache(self):
+        markdown = "* nav\n* links\n\nBody **one**\n\n* nav\n* links"
+        cached = markdown_to_html(markdown)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 2))
+        disable_block_cache()
+        self.assertEqual(markdown_to_html(markdown), cached)
+
+    def test_cached_node_is_reused(self):
+        first = block_to_html("> shared *footer*")
+        self.assertIs(block_to_html("> shared *footer*"), first)
+
+
+if __name__ == "__main__":
+    unittest.main()
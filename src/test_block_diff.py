@@ -0,0 +1,57 @@
+import unittest
+
+from block_diff import DocumentRenderer
+from block_markdown import markdown_to_html
+
+
+def full_render(markdown: str) -> str:
+    return "".join(node.to_html() for node in markdown_to_html(markdown))
+
+
+class TestDocumentRenderer(unittest.TestCase):
+    def setUp(self):
+        self.blocks = [f"## Section {index}\n\n- item *{index}*" for index in range(5)]
+        self.markdown = "\n\n".join(self.blocks)
+        self.renderer = DocumentRenderer()
+        self.renderer.render(self.markdown)
+
+    def render(self, blocks: list[str]) -> str:
+        markdown = "\n\n".join(blocks)
+        html = self.renderer.render(markdown)
+        self.assertEqual(html, full_render(markdown))
+        return html
+
+    def test_first_render_renders_every_block(self):
+        self.assertEqual((self.renderer.rendered, self.renderer.reused), (10, 0))
+
+    def test_unchanged_document_reuses_every_block(self):
+        self.render(self.blocks)
+        self.assertEqual((self.renderer.rendered, self.renderer.reused), (0, 10))
+
+    def test_edit_renders_only_changed_block(self):
+        self.blocks[2] = "## Section 2\n\n- item **edited**"
+        self.render(self.blocks)
+        self.assertEqual((self.renderer.rendered, self.renderer.reused), (1, 9))
+
+    def test_insert_and_delete(self):
+        self.blocks.insert(3, "A new paragraph")
+        self.render(self.blocks)
+        self.assertEqual(self.renderer.rendered, 1)
+        del self.blocks[0]
+        self.render(self.blocks)
+        self.assertEqual(self.renderer.rendered, 0)
+
+    def test_moved_block_is_reused(self):
+        self.blocks[1], self.blocks[3] = self.blocks[3], self.blocks[1]
+        self.render(self.blocks)
+        self.assertEqual(self.renderer.rendered, 0)
+
+    def test_invalid_edit_keeps_previous_state(self):
+        with self.assertRaises(ValueError):
+            self.renderer.render(self.markdown + "\n\n**unclosed")
+        self.render(self.blocks)
+        self.assertEqual(self.renderer.rendered, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,9 @@
-from collections.abc import Sequence
+from collections.abc import Iterator, Sequence
+import io
 import unittest
 
+import block_markdown
+import instrumentation
 from block_markdown import (
     extract_code_from_block,
     extract_heading_from_block,
@@ -11,7 +14,11 @@ from block_markdown import (
     block_to_block_type,
     BlockType,
     markdown_to_html,
+    markdown_to_html_many,
+    stream_markdown_to_blocks,
+    stream_markdown_to_html,
 )
+from lazyparentnode import LazyParentNode
 from leafnode import LeafNode
 from parentnode import ParentNode
 
@@ -420,6 +427,16 @@ This is a paragraph of text. It has some **bold** and *italic* words inside of i
             with self.subTest(block=block):
                 self.assertEqual(block_to_block_type(block), BlockType.PARAGRAPH)
 
+    def test_long_ordered_list(self):
+        block = "\n".join(f"{index}. item {index}" for index in range(1, 13))
+        self.assertEqual(block_to_block_type(block), BlockType.ORDERED_LIST)
+        node = extract_ordered_list_from_block(block)
+        self.assertEqual(len(node.children or []), 12)
+        self.assertEqual(node.children[11], ParentNode("li", [LeafNode("item 12")]))  # type: ignore[index]
+
+        skipped = block.replace("10. item", "11. item")
+        self.assertEqual(block_to_block_type(skipped), BlockType.PARAGRAPH)
+
     def test_markdown_to_blocks_clean(self):
         markdown = """# This is a heading
 
@@ -463,5 +480,156 @@ This is a paragraph of text. It has some **bold** and *italic* words inside of i
         self.assertEqual(blocks, expected)
 
 
+class TestLazyMarkdown(unittest.TestCase):
+    markdown = """# Title
+
+A paragraph with **bold** text.
+
+> A *quoted* line
+
+- first **item**
+- second
+
+1. one
+2. `two`"""
+
+    def test_lazy_tree_equals_eager_tree(self):
+        self.assertEqual(
+            markdown_to_html(self.markdown, lazy=True), markdown_to_html(self.markdown)
+        )
+
+    def test_lazy_tree_defers_inline_parsing(self):
+        nodes = markdown_to_html(self.markdown, lazy=True)
+        headings = [node for node in nodes if isinstance(node, LeafNode)]
+        self.assertEqual(headings, [LeafNode("Title", "h1")])
+        paragraph = nodes[1]
+        self.assertIsInstance(paragraph, LazyParentNode)
+        self.assertFalse(paragraph.is_loaded)  # type: ignore[attr-defined]
+        self.assertEqual(
+            paragraph.to_html(), "<p>A paragraph with <b>bold</b> text.</p>"
+        )
+        self.assertTrue(paragraph.is_loaded)  # type: ignore[attr-defined]
+
+    def test_lazy_tree_reports_invalid_markup_on_access(self):
+        nodes = markdown_to_html("# Fine\n\nBroken **markup", lazy=True)
+        with self.assertRaises(ValueError):
+            nodes[1].to_html()
+
+
+class TestStreamMarkdown(unittest.TestCase):
+    markdown = """    # This is a heading
+
+
+This is a paragraph of text. It has some **bold** and *italic* words inside of it.
+
+
+
+```
+# A fancy code block~~
+```
+
+> A quote
+>
+> with an empty line
+
+* This is the first item
+- This is **another** list item
+
+ \n\n1. This is the first item
+2. Too many *cool* items!
+"""
+
+    def test_stream_markdown_to_blocks_from_file(self):
+        self.assertEqual(
+            list(stream_markdown_to_blocks(io.StringIO(self.markdown))),
+            markdown_to_blocks(self.markdown),
+        )
+
+    def test_stream_markdown_to_blocks_from_chunks(self):
+        for size in range(1, 8):
+            chunks = [
+                self.markdown[i : i + size]
+                for i in range(0, len(self.markdown), size)
+            ]
+            with self.subTest(size=size):
+                self.assertEqual(
+                    list(stream_markdown_to_blocks(chunks)),
+                    markdown_to_blocks(self.markdown),
+                )
+
+    def test_stream_markdown_to_html(self):
+        self.assertEqual(
+            list(stream_markdown_to_html(self.markdown.splitlines(keepends=True))),
+            markdown_to_html(self.markdown),
+        )
+
+    def test_stream_yields_before_reading_everything(self):
+        def lines() -> Iterator[str]:
+            yield "# First heading\n"
+            yield "\n"
+            raise AssertionError("read past the first block")
+
+        blocks = stream_markdown_to_html(lines())
+        self.assertEqual(next(blocks), LeafNode("First heading", "h1"))
+
+
+class TestMarkdownToHtmlMany(unittest.TestCase):
+    documents = [
+        "# Title\n\nSome **bold** text",
+        "Thanks!",
+        "",
+        "Thanks!",
+        "* one\n* two\n\n\n\n  Thanks!  ",
+        "> quoted *text*",
+    ]
+
+    def expected(self) -> list[str]:
+        return [
+            "".join(node.to_html() for node in markdown_to_html(markdown))
+            for markdown in self.documents
+        ]
+
+    def test_matches_markdown_to_html(self):
+        self.assertEqual(markdown_to_html_many(self.documents), self.expected())
+
+    def test_without_block_cache(self):
+        self.assertEqual(
+            markdown_to_html_many(self.documents, block_cache_entries=0),
+            self.expected(),
+        )
+
+    def test_full_block_cache(self):
+        self.assertEqual(
+            markdown_to_html_many(iter(self.documents), block_cache_entries=1),
+            self.expected(),
+        )
+
+    def test_leaves_global_block_cache_alone(self):
+        self.assertIsNone(block_markdown.block_cache)
+        markdown_to_html_many(self.documents)
+        self.assertIsNone(block_markdown.block_cache)
+
+    def test_records_serialize_phase(self):
+        profiler = instrumentation.enable_profiler()
+        try:
+            markdown_to_html_many(self.documents)
+        finally:
+            instrumentation.disable_profiler()
+        phases = profiler.phases()
+        # One call per document plus one per distinct block.
+        self.assertEqual(phases["serialize"].calls, len(self.documents) + 5)
+        self.assertEqual(phases["block_to_block_type"].calls, 5)
+
+    def test_processes(self):
+        self.assertEqual(
+            markdown_to_html_many(self.documents, jobs=2, chunksize=2),
+            self.expected(),
+        )
+
+    def test_invalid_document(self):
+        with self.assertRaises(ValueError):
+            markdown_to_html_many(["fine", "**unclosed"])
+
+
 if __name__ == "__main__":
     unittest.main()
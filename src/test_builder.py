@@ -0,0 +1,350 @@
+import os
+import stat
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import block_markdown
+import builder
+from block_markdown import markdown_to_html
+from builder import PHASES, build_site, discover_pages, flat_page_title, page_title
+from flat_document import markdown_to_flat
+from metadata import scan_metadata
+
+
+def write_file(path: Path, text: str):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+class TestBuilder(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        self.content = self.root / "content"
+        self.output = self.root / "public"
+        self.static = self.root / "static"
+        write_file(self.content / "index.md", "# Home\n\nSome **bold** text")
+        write_file(self.content / "blog" / "post.md", "* one\n* two")
+        write_file(self.content / "notes.txt", "not markdown")
+        write_file(self.static / "css" / "site.css", "body {}")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def spools(self) -> list[Path]:
+        return [path for path in self.output.rglob("*") if "spool" in path.name]
+
+    def test_discover_pages(self):
+        self.assertEqual(
+            discover_pages(self.content),
+            [Path("blog/post.md"), Path("index.md")],
+        )
+
+    def test_build_site_renders_pages(self):
+        report = build_site(self.content, self.output, self.static)
+        self.assertEqual(report.pages, 2)
+        self.assertEqual(
+            (self.output / "index.html").read_text(),
+            "<h1>Home</h1><p>Some <b>bold</b> text</p>",
+        )
+        self.assertEqual(
+            (self.output / "blog" / "post.html").read_text(),
+            "<ul><li>one</li><li>two</li></ul>",
+        )
+        self.assertFalse((self.output / "notes.html").exists())
+
+    def test_build_site_records_page_stats(self):
+        report = build_site(self.content, self.output)
+        stats = {page.page: page for page in report.page_stats}
+        self.assertEqual(set(stats), {"index.md", "blog/post.md"})
+        post = stats["blog/post.md"]
+        self.assertEqual((post.blocks, post.nodes), (1, 5))
+        self.assertEqual(post.source_chars, len("* one\n* two"))
+        self.assertEqual(
+            post.output_bytes, len("<ul><li>one</li><li>two</li></ul>")
+        )
+
+    def test_build_site_copies_static_assets(self):
+        report = build_site(self.content, self.output, self.static)
+        self.assertEqual(report.assets, 1)
+        self.assertEqual((self.output / "css" / "site.css").read_text(), "body {}")
+
+    def test_build_site_reports_every_phase(self):
+        report = build_site(self.content, self.output)
+        self.assertEqual(tuple(report.timings), PHASES)
+        self.assertTrue(all(timing >= 0 for timing in report.timings.values()))
+        self.assertIn("parse", report.format())
+
+    def test_build_site_parallel_matches_serial(self):
+        for index in range(12):
+            write_file(
+                self.content / "many" / f"page{index}.md",
+                f"## Page {index}\n\n1. *first*\n2. [link](/{index})",
+            )
+        serial = self.root / "serial"
+        parallel = self.root / "parallel"
+        build_site(self.content, serial)
+        report = build_site(self.content, parallel, jobs=3)
+        self.assertEqual(report.pages, 14)
+        for page in discover_pages(self.content):
+            html = page.with_suffix(".html")
+            with self.subTest(page=page):
+                self.assertEqual(
+                    (parallel / html).read_bytes(), (serial / html).read_bytes()
+                )
+
+    def test_build_site_with_block_cache(self):
+        write_file(self.content / "other.md", "# Home\n\nOther page")
+        report = build_site(self.content, self.output, block_cache_entries=16)
+        self.assertIsNone(block_markdown.block_cache)
+        self.assertIsNotNone(report.block_cache)
+        self.assertEqual(report.block_cache["hits"], 1)  # type: ignore[index]
+        self.assertEqual(
+            (self.output / "other.html").read_text(), "<h1>Home</h1><p>Other page</p>"
+        )
+
+    def test_block_cache_stats_follow_the_serial_path(self):
+        self.addCleanup(block_markdown.disable_block_cache)
+        previous = block_markdown.enable_block_cache()
+        (self.content / "blog" / "post.md").unlink()
+        report = build_site(self.content, self.output, jobs=4, block_cache_entries=16)
+        self.assertIsNotNone(report.block_cache)
+        self.assertIs(block_markdown.block_cache, previous)
+
+    def test_incremental_build_skips_unchanged_pages(self):
+        build_site(self.content, self.output)
+        report = build_site(self.content, self.output)
+        self.assertEqual((report.pages, report.unchanged), (0, 2))
+
+        write_file(self.content / "index.md", "# New home")
+        report = build_site(self.content, self.output)
+        self.assertEqual((report.pages, report.unchanged), (1, 1))
+        self.assertEqual((self.output / "index.html").read_text(), "<h1>New home</h1>")
+
+    def test_incremental_build_removes_deleted_pages(self):
+        build_site(self.content, self.output)
+        (self.content / "blog" / "post.md").unlink()
+        report = build_site(self.content, self.output)
+        self.assertEqual(report.removed, 1)
+        self.assertFalse((self.output / "blog" / "post.html").exists())
+        self.assertTrue((self.output / "index.html").exists())
+
+    def test_incremental_build_restores_missing_output(self):
+        build_site(self.content, self.output)
+        (self.output / "index.html").unlink()
+        report = build_site(self.content, self.output)
+        self.assertEqual(report.pages, 1)
+        self.assertTrue((self.output / "index.html").exists())
+
+    def test_forced_build_renders_every_page(self):
+        build_site(self.content, self.output)
+        report = build_site(self.content, self.output, incremental=False)
+        self.assertEqual((report.pages, report.unchanged), (2, 0))
+
+    def test_build_site_applies_template(self):
+        layout = self.root / "layout.html"
+        write_file(layout, "<title>{{ title }}</title>{{ content }}")
+        build_site(self.content, self.output, template_path=layout, jobs=2)
+        self.assertEqual(
+            (self.output / "index.html").read_text(),
+            "<title>Home</title><h1>Home</h1><p>Some <b>bold</b> text</p>",
+        )
+        self.assertEqual(
+            (self.output / "blog" / "post.html").read_text(),
+            "<title>post</title><ul><li>one</li><li>two</li></ul>",
+        )
+
+    def test_page_title_matches_scan_metadata(self):
+        for markdown in (
+            "## Intro\n\ntext\n\n# Main *title*",
+            "### Only\n\n#### Second",
+            "no headings\n\n    # code",
+            "> # quoted\n\n## Real",
+        ):
+            with self.subTest(markdown=markdown):
+                title = scan_metadata(markdown, summary_chars=0).title
+                self.assertEqual(page_title(markdown_to_html(markdown)), title)
+                self.assertEqual(flat_page_title(markdown_to_flat(markdown)), title)
+
+    def test_template_change_rebuilds_every_page(self):
+        layout = self.root / "layout.html"
+        write_file(layout, "<main>{{ content }}</main>")
+        build_site(self.content, self.output, template_path=layout)
+        report = build_site(self.content, self.output, template_path=layout)
+        self.assertEqual(report.pages, 0)
+        write_file(layout, "<article>{{ content }}</article>")
+        report = build_site(self.content, self.output, template_path=layout)
+        self.assertEqual(report.pages, 2)
+        self.assertTrue(
+            (self.output / "index.html").read_text().startswith("<article>")
+        )
+
+    def test_build_site_rejects_unknown_placeholders(self):
+        layout = self.root / "layout.html"
+        write_file(layout, "{{ nav }}{{ content }}")
+        with self.assertRaisesRegex(ValueError, "nav"):
+            build_site(self.content, self.output, template_path=layout)
+        self.assertFalse(self.output.exists())
+
+    def test_build_site_missing_template(self):
+        with self.assertRaises(ValueError):
+            build_site(self.content, self.output, template_path=self.root / "none.html")
+
+    def test_forced_build_keeps_identical_outputs(self):
+        build_site(self.content, self.output)
+        index = self.output / "index.html"
+        os.utime(index, ns=(0, 1_000_000_000))
+        write_file(self.content / "blog" / "post.md", "* three")
+        report = build_site(self.content, self.output, incremental=False)
+        self.assertEqual((report.pages, report.identical), (2, 1))
+        self.assertEqual(index.stat().st_mtime_ns, 1_000_000_000)
+        self.assertEqual(
+            (self.output / "blog" / "post.html").read_text(), "<ul><li>three</li></ul>"
+        )
+
+    def test_build_site_inline_writes_match_background_writes(self):
+        build_site(self.content, self.output, writers=0)
+        inline = (self.output / "index.html").read_bytes()
+        report = build_site(self.content, self.output, incremental=False, writers=2)
+        self.assertEqual(report.identical, 2)
+        self.assertEqual((self.output / "index.html").read_bytes(), inline)
+
+    def test_output_cache_is_shared_between_checkouts(self):
+        cache = self.root / "cache"
+        build_site(self.content, self.output, cache_dir=cache)
+        other = self.root / "other-public"
+        report = build_site(self.content, other, cache_dir=cache)
+        self.assertEqual(report.pages, 2)
+        self.assertEqual(report.output_cache, {"hits": 2, "misses": 0, "added": 0})
+        self.assertEqual(report.page_stats, [])
+        self.assertEqual(
+            (other / "index.html").read_text(),
+            (self.output / "index.html").read_text(),
+        )
+
+    def test_output_cache_keys_include_template(self):
+        cache = self.root / "cache"
+        layout = self.root / "layout.html"
+        write_file(layout, "<main>{{ content }}</main>")
+        build_site(self.content, self.output, cache_dir=cache)
+        report = build_site(
+            self.content, self.root / "other", cache_dir=cache, template_path=layout
+        )
+        self.assertEqual(report.output_cache["hits"], 0)
+        self.assertEqual(
+            (self.root / "other" / "blog" / "post.html").read_text(),
+            "<main><ul><li>one</li><li>two</li></ul></main>",
+        )
+
+    def test_large_sources_are_memory_mapped(self):
+        layout = self.root / "layout.html"
+        write_file(layout, "<title>{{ title }}</title>{{ content }}")
+        write_file(self.content / "crlf.md", "# Windows\r\n\r\nline\r\nbreak")
+        build_site(self.content, self.output, template_path=layout)
+        expected = {
+            path: path.read_bytes() for path in self.output.rglob("*.html")
+        }
+        with mock.patch.object(builder, "MAPPED_SOURCE_BYTES", 0):
+            report = build_site(
+                self.content, self.output, incremental=False, template_path=layout
+            )
+        self.assertEqual(report.identical, 3)
+        self.assertEqual(
+            {path: path.read_bytes() for path in self.output.rglob("*.html")}, expected
+        )
+        stats = {page.page: page for page in report.page_stats}
+        self.assertEqual((stats["blog/post.md"].blocks, stats["blog/post.md"].nodes), (1, 5))
+        self.assertEqual(self.spools(), [])
+
+    def test_large_sources_stream_into_the_template_and_cache(self):
+        layout = self.root / "layout.html"
+        write_file(layout, "<title>{{ title }}</title>{{ content }}<hr>{{ content }}")
+        write_file(self.content / "notes.md", "## Intro\n\n# Main\n\n# Later")
+        cache = self.root / "cache"
+        with mock.patch.object(builder, "MAPPED_SOURCE_BYTES", 0):
+            report = build_site(
+                self.content, self.output, template_path=layout, cache_dir=cache
+            )
+        home = "<h1>Home</h1><p>Some <b>bold</b> text</p>"
+        expected = f"<title>Home</title>{home}<hr>{home}".encode()
+        self.assertEqual((self.output / "index.html").read_bytes(), expected)
+        stats = {page.page: page for page in report.page_stats}
+        self.assertEqual(stats["index.md"].output_bytes, len(expected))
+        self.assertEqual(self.spools(), [])
+        notes = (self.output / "notes.html").read_text()
+        self.assertTrue(notes.startswith("<title>Main</title>"))
+        other = self.root / "other"
+        report = build_site(self.content, other, template_path=layout, cache_dir=cache)
+        self.assertEqual(report.output_cache["hits"], 3)  # type: ignore[index]
+        self.assertEqual((other / "index.html").read_bytes(), expected)
+
+    def test_large_sources_get_the_usual_file_mode(self):
+        write_file(self.content / "big.md", "# Big\n\n" + "text " * 64)
+        self.addCleanup(os.umask, os.umask(0o022))
+        with mock.patch.object(builder, "MAPPED_SOURCE_BYTES", 256):
+            build_site(self.content, self.output)
+        for page in ("big.html", "index.html"):
+            self.assertEqual(stat.S_IMODE((self.output / page).stat().st_mode), 0o644)
+
+    def test_failed_parallel_build_removes_spools(self):
+        write_file(self.content / "bad.md", "**unclosed")
+        write_file(self.content / "z_big.md", "# Big\n\n" + "text " * 64)
+        with mock.patch.object(builder, "MAPPED_SOURCE_BYTES", 256):
+            with self.assertRaises(ValueError):
+                build_site(self.content, self.output, jobs=2)
+        self.assertEqual(self.spools(), [])
+
+    def test_manifest_is_kept_out_of_the_output(self):
+        write_file(self.output / ".build-manifest.json", "{}")
+        build_site(self.content, self.output, self.static)
+        self.assertEqual(
+            sorted(path.name for path in self.output.rglob("*") if path.is_file()),
+            ["index.html", "post.html", "site.css"],
+        )
+        self.assertTrue((self.root / ".public.build-manifest.json").is_file())
+        report = build_site(self.content, self.output, self.static)
+        self.assertEqual(report.unchanged, 2)
+
+    def test_manifest_records_the_rendered_source(self):
+        page = self.content / "index.md"
+        render_page_file = builder.render_page_file
+
+        def edit_then_render(source: Path, *args, **kwargs):
+            # The page is saved again after discover hashed it.
+            write_file(page, "# Edited")
+            return render_page_file(source, *args, **kwargs)
+
+        with mock.patch.object(builder, "render_page_file", edit_then_render):
+            build_site(self.content, self.output)
+        self.assertIn(b"Edited", (self.output / "index.html").read_bytes())
+        os.utime(page, ns=(0, 0))
+        report = build_site(self.content, self.output)
+        self.assertEqual((report.pages, report.unchanged), (0, 2))
+
+    def test_flat_build_matches_node_build(self):
+        build_site(self.content, self.output)
+        expected = {path: path.read_bytes() for path in self.output.rglob("*.html")}
+        report = build_site(self.content, self.output, incremental=False, flat=True)
+        self.assertEqual(report.identical, 2)
+        self.assertEqual(
+            {path: path.read_bytes() for path in self.output.rglob("*.html")}, expected
+        )
+        stats = {page.page: page for page in report.page_stats}
+        self.assertEqual((stats["blog/post.md"].blocks, stats["blog/post.md"].nodes), (1, 5))
+
+    def test_parse_errors_name_the_page(self):
+        write_file(self.content / "blog" / "bad.md", "**unclosed")
+        for jobs in (1, 2):
+            with self.subTest(jobs=jobs):
+                with self.assertRaisesRegex(ValueError, r"blog/bad\.md: Incorrectly"):
+                    build_site(self.content, self.output, jobs=jobs, incremental=False)
+
+    def test_build_site_missing_content(self):
+        with self.assertRaises(ValueError):
+            build_site(self.root / "missing", self.output)
+
+
+if __name__ == "__main__":
+    unittest.main()
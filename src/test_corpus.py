@@ -0,0 +1,45 @@
+import unittest
+
+from block_markdown import BlockType, block_to_block_type, markdown_to_blocks, markdown_to_html
+from corpus import CorpusConfig, generate_corpus
+
+
+class TestCorpus(unittest.TestCase):
+    def test_same_seed_same_corpus(self):
+        config = CorpusConfig(seed=7, pages=3, page_size=2048)
+        self.assertEqual(generate_corpus(config), generate_corpus(config))
+        other = CorpusConfig(seed=8, pages=3, page_size=2048)
+        self.assertNotEqual(generate_corpus(config), generate_corpus(other))
+
+    def test_page_count_and_size(self):
+        documents = generate_corpus(CorpusConfig(pages=4, page_size=5000))
+        self.assertEqual(len(documents), 4)
+        for document in documents:
+            self.assertGreaterEqual(len(document), 5000 - 2)
+
+    def test_block_mix(self):
+        config = CorpusConfig(
+            pages=2, page_size=3000, block_mix={BlockType.ORDERED_LIST.value: 1}
+        )
+        for document in generate_corpus(config):
+            for block in markdown_to_blocks(document):
+                self.assertEqual(block_to_block_type(block), BlockType.ORDERED_LIST)
+
+    def test_list_length(self):
+        config = CorpusConfig(
+            pages=1,
+            page_size=100,
+            block_mix={BlockType.UNORDERED_LIST.value: 1},
+            list_length=9,
+        )
+        block = markdown_to_blocks(generate_corpus(config)[0])[0]
+        self.assertEqual(len(block.splitlines()), 9)
+
+    def test_corpus_is_valid_markdown(self):
+        config = CorpusConfig(pages=5, page_size=4096, inline_density=0.8)
+        for document in generate_corpus(config):
+            markdown_to_html(document)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,188 @@
+import http.client
+import io
+import os
+import tempfile
+import threading
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+
+from builder import build_site
+from dev_server import SiteWatcher, make_server, scan_tree
+
+
+def write_file(path: Path, text: str):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+def touch(path: Path, offset_ns: int = 1_000_000_000):
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + offset_ns))
+
+
+class TestSiteWatcher(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        self.content = self.root / "content"
+        self.output = self.root / "public"
+        self.static = self.root / "static"
+        write_file(self.content / "index.md", "# Home")
+        write_file(self.content / "blog" / "post.md", "Old text")
+        write_file(self.static / "site.css", "body {}")
+        build_site(self.content, self.output, self.static)
+        self.watcher = SiteWatcher(self.content, self.output, self.static)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_scan_tree(self):
+        self.assertEqual(set(scan_tree(self.content, ".md")), {"index.md", "blog/post.md"})
+        self.assertEqual(scan_tree(self.root / "missing"), {})
+
+    def test_poll_without_changes(self):
+        self.assertFalse(self.watcher.poll())
+
+    def test_poll_renders_changed_page(self):
+        write_file(self.content / "blog" / "post.md", "New *text*")
+        touch(self.content / "blog" / "post.md")
+        result = self.watcher.poll()
+        self.assertEqual(result.rendered, ["blog/post.md"])
+        self.assertEqual(
+            (self.output / "blog" / "post.html").read_text(),
+            "<p>New <i>text</i></p>",
+        )
+        self.assertFalse(self.watcher.poll())
+
+    def test_poll_handles_added_and_removed_pages(self):
+        write_file(self.content / "new.md", "## New")
+        (self.content / "index.md").unlink()
+        result = self.watcher.poll()
+        self.assertEqual(result.rendered, ["new.md"])
+        self.assertEqual(result.removed, ["index.md"])
+        self.assertTrue((self.output / "new.html").exists())
+        self.assertFalse((self.output / "index.html").exists())
+
+    def test_poll_keeps_output_of_broken_page(self):
+        write_file(self.content / "index.md", "**unclosed")
+        touch(self.content / "index.md")
+        stderr = io.StringIO()
+        with redirect_stderr(stderr):
+            self.assertEqual(self.watcher.poll().rendered, [])
+        self.assertEqual(
+            stderr.getvalue(), "error: index.md: Incorrectly formatted type.\n"
+        )
+        self.assertEqual((self.output / "index.html").read_text(), "<h1>Home</h1>")
+
+    def test_poll_copies_changed_assets(self):
+        write_file(self.static / "site.css", "body { margin: 0 }")
+        touch(self.static / "site.css")
+        self.assertEqual(self.watcher.poll().assets, 1)
+        self.assertEqual(
+            (self.output / "site.css").read_text(), "body { margin: 0 }"
+        )
+
+    def test_poll_removes_deleted_assets(self):
+        write_file(self.static / "img" / "logo.svg", "<svg/>")
+        self.assertEqual(self.watcher.poll().assets, 1)
+        (self.static / "img" / "logo.svg").unlink()
+        result = self.watcher.poll()
+        self.assertEqual(result.removed_assets, ["img/logo.svg"])
+        self.assertFalse((self.output / "img" / "logo.svg").exists())
+        self.assertTrue((self.output / "site.css").exists())
+
+    def test_poll_reports_errors_on_stderr(self):
+        write_file(self.content / "index.md", "**unclosed")
+        touch(self.content / "index.md")
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            self.watcher.poll()
+        self.assertEqual(stdout.getvalue(), "")
+        self.assertIn("index.md", stderr.getvalue())
+
+    def test_poll_applies_template(self):
+        layout = self.root / "layout.html"
+        write_file(layout, "<main>{{ content }}</main>")
+        watcher = SiteWatcher(self.content, self.output, self.static, layout)
+        write_file(self.content / "index.md", "# Welcome")
+        touch(self.content / "index.md")
+        self.assertEqual(watcher.poll().rendered, ["index.md"])
+        self.assertEqual(
+            (self.output / "index.html").read_text(), "<main><h1>Welcome</h1></main>"
+        )
+
+        write_file(layout, "<body>{{ content }}</body>")
+        touch(layout)
+        self.assertEqual(
+            sorted(watcher.poll().rendered), ["blog/post.md", "index.md"]
+        )
+        self.assertEqual(
+            (self.output / "blog" / "post.html").read_text(),
+            "<body><p>Old text</p></body>",
+        )
+
+    def test_poll_removes_pages_deleted_with_a_layout_change(self):
+        layout = self.root / "layout.html"
+        write_file(layout, "<main>{{ content }}</main>")
+        watcher = SiteWatcher(self.content, self.output, self.static, layout)
+        watcher.poll()
+        self.assertTrue((self.output / "blog" / "post.html").exists())
+
+        write_file(layout, "<body>{{ content }}</body>")
+        touch(layout)
+        (self.content / "blog" / "post.md").unlink()
+        result = watcher.poll()
+        self.assertEqual(result.rendered, ["index.md"])
+        self.assertEqual(result.removed, ["blog/post.md"])
+        self.assertFalse((self.output / "blog" / "post.html").exists())
+
+
+class TestSiteRequestHandler(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.output = Path(self.temp_dir.name)
+        write_file(self.output / "index.html", "<h1>Home</h1>")
+        self.server = make_server(self.output, "127.0.0.1", 0)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+        self.temp_dir.cleanup()
+
+    def get(self, path: str, headers: dict[str, str] | None = None):
+        connection = http.client.HTTPConnection(*self.server.server_address[:2])
+        connection.request("GET", path, headers=headers or {})
+        response = connection.getresponse()
+        body = response.read()
+        connection.close()
+        return response, body
+
+    def test_get_sends_etag(self):
+        response, body = self.get("/index.html")
+        self.assertEqual(response.status, 200)
+        self.assertEqual(body, b"<h1>Home</h1>")
+        self.assertIsNotNone(response.getheader("ETag"))
+
+    def test_conditional_get(self):
+        response, _ = self.get("/")
+        etag = response.getheader("ETag")
+        response, body = self.get("/", {"If-None-Match": etag})
+        self.assertEqual(response.status, 304)
+        self.assertEqual(body, b"")
+
+        write_file(self.output / "index.html", "<h1>Changed home</h1>")
+        response, body = self.get("/", {"If-None-Match": etag})
+        self.assertEqual(response.status, 200)
+        self.assertEqual(body, b"<h1>Changed home</h1>")
+
+    def test_missing_page(self):
+        response, _ = self.get("/missing.html")
+        self.assertEqual(response.status, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+import io
+import random
+import unittest
+
+from block_markdown import markdown_to_html
+from corpus import CorpusConfig, generate_corpus
+from flat_document import FlatDocument, NodeKind, markdown_to_flat
+from leafnode import LeafNode
+from parentnode import ParentNode
+
+
+class TestFlatDocument(unittest.TestCase):
+    markdown = """# Heading
+
+A paragraph with **bold**, *italic*, `code`, a [link](https://boot.dev)
+and an ![image](cat.png).
+
+> first *quote* line
+>
+> second line
+
+```
+code block
+```
+
+* one
+- two **items**
+
+1. first
+2. second"""
+
+    def assert_same_as_nodes(self, markdown: str):
+        try:
+            nodes = markdown_to_html(markdown)
+        except ValueError:
+            with self.assertRaises(ValueError):
+                markdown_to_flat(markdown)
+            return
+        document = markdown_to_flat(markdown)
+        self.assertEqual(document.to_html(), "".join(node.to_html() for node in nodes))
+        self.assertEqual(document.to_html_nodes(), list(nodes))
+
+    def test_matches_node_tree(self):
+        self.assert_same_as_nodes(self.markdown)
+
+    def test_matches_node_tree_on_corpus(self):
+        for page in generate_corpus(CorpusConfig(pages=5, page_size=4096)):
+            self.assert_same_as_nodes(page)
+
+    def test_matches_node_tree_on_random_markup(self):
+        pieces = ["a", " ", "*", "**", "`", "![", "](", ")", "[", "\n", "\n\n",
+                  "# ", "> ", ">", "- ", "* ", "1. ", "2. ", "```", "\r\n", "\r"]
+        rng = random.Random(7)
+        for _ in range(2000):
+            markdown = "".join(rng.choice(pieces) for _ in range(rng.randint(0, 16)))
+            with self.subTest(markdown=markdown):
+                self.assert_same_as_nodes(markdown)
+
+    def test_text_is_shared_with_source(self):
+        document = markdown_to_flat(self.markdown)
+        self.assertIs(document.text, self.markdown)
+        link = document.kinds.index(NodeKind.LINK)
+        self.assertEqual(document.value(link), "link")
+        self.assertEqual(document.url(link), "https://boot.dev")
+        self.assertEqual(document.tag(link), "a")
+
+    def test_structure(self):
+        document = markdown_to_flat("* one\n* **two**\n\nafter")
+        items, paragraph = document.roots()
+        self.assertEqual(document.tag(items), "ul")
+        first, second = document.children(items)
+        self.assertEqual((document.tag(first), document.parents[first]), ("li", items))
+        (bold,) = document.children(second)
+        self.assertEqual((document.tag(bold), document.value(bold)), ("b", "two"))
+        self.assertEqual(document.parents[paragraph], -1)
+        self.assertEqual(len(document), 7)
+
+    def test_write_html(self):
+        stream = io.StringIO()
+        markdown_to_flat("*hi*").write_html(stream)
+        self.assertEqual(stream.getvalue(), "<p><i>hi</i></p>")
+
+    def test_empty_document(self):
+        document = markdown_to_flat("")
+        self.assertEqual((len(document), document.to_html()), (0, ""))
+
+    def test_invalid_markup(self):
+        with self.assertRaises(ValueError):
+            markdown_to_flat("**unclosed")
+
+
+class TestFlatDocumentConversion(unittest.TestCase):
+    def test_round_trip_of_parsed_nodes(self):
+        nodes = markdown_to_html(TestFlatDocument.markdown)
+        document = FlatDocument.from_html_nodes(nodes)
+        self.assertEqual(document.to_html_nodes(), list(nodes))
+        self.assertEqual(
+            document.to_html(), "".join(node.to_html() for node in nodes)
+        )
+
+    def test_round_trip_with_props_and_custom_tags(self):
+        nodes = [
+            ParentNode(
+                "section",
+                [
+                    LeafNode("note", "span", {"class": "hint"}),
+                    LeafNode("plain"),
+                    LeafNode("x", "a", {"href": "/", "title": "home"}),
+                    LeafNode("", "img", {"alt": "a", "src": "b"}),
+                ],
+                {"id": "main"},
+            ),
+            LeafNode("Ctrl", "kbd"),
+        ]
+        document = FlatDocument.from_html_nodes(nodes)
+        self.assertEqual(document.to_html_nodes(), nodes)
+        self.assertEqual(
+            document.to_html(), "".join(node.to_html() for node in nodes)
+        )
+
+    def test_deep_tree(self):
+        node = LeafNode("deep")
+        for _ in range(5000):
+            node = ParentNode("li", [node])
+        document = FlatDocument.from_html_nodes([node])
+        self.assertEqual(len(document), 5001)
+        self.assertEqual(document.to_html(), node.to_html())
+
+    def test_invalid_nodes(self):
+        with self.assertRaises(ValueError):
+            FlatDocument.from_html_nodes([LeafNode(None)])
+        with self.assertRaises(ValueError):
+            FlatDocument.from_html_nodes([ParentNode(None, [])])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,9 @@
+import io
 import unittest
 
 from htmlnode import HTMLNode
+from leafnode import LeafNode
+from parentnode import ParentNode
 
 
 class TestHTMLNode(unittest.TestCase):
@@ -36,6 +39,15 @@ class TestHTMLNode(unittest.TestCase):
             "HTMLNode(a, this is a link, None, {'href': 'https://www.google.com'})",
         )
 
+    def test_write_html_not_implemented(self):
+        with self.assertRaises(NotImplementedError):
+            HTMLNode("p", "text").write_html(io.StringIO())
+
+    def test_nodes_have_no_instance_dict(self):
+        for node in (HTMLNode(), LeafNode("text"), ParentNode("p", [])):
+            with self.subTest(node=node):
+                self.assertFalse(hasattr(node, "__dict__"))
+
 
 if __name__ == "__main__":
     unittest.main()
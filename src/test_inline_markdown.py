@@ -1,8 +1,10 @@
+import random
 import unittest
 
 from inline_markdown import (
     extract_markdown_images,
     extract_markdown_links,
+    scan_inline,
     split_nodes_delimiter,
     split_nodes_image,
     split_nodes_link,
@@ -318,5 +320,90 @@ class TestInlineMarkdown(unittest.TestCase):
         )
 
 
+class TestSinglePassTokenizer(unittest.TestCase):
+    corpus = [
+        "This is **text** with an *italic* word and a `code block` and an ![obi wan image](https://i.imgur.com/fJRm4Vk.jpeg) and a [link](https://boot.dev)",
+        "This is a **bold** text node",
+        "This is a **bold**, **very bold**, **extremely bold** text node",
+        "This is a *italic* text node",
+        "This is a `code` text node",
+        "This is just a plain text",
+        "This is a text with ![an image](imageurl.com)",
+        "This is a text with ![an image](imageurl.com) and ![another image](imageurl.com/another)",
+        "This is a text with [a link](google.com)",
+        "This is a text with [a link](google.com) and [another link](boot.dev)",
+        "![An image](imageurl.com)! Amazing.",
+        "[An link](google.com) Amazing.",
+        "This is a paragraph of text. It has some **bold** and *italic* words inside of it.",
+        "mixed **bold item** and *italic* item.",
+        "`This is another fancy code~~`",
+        "Too many *cool* items!",
+        "",
+        "****",
+        "***bold then italic***",
+        "**bold with *stars* and `ticks`**",
+        "*italic with `ticks`*",
+        "`code with **stars**`",
+        "*italic with **bold***",
+        "**unclosed bold",
+        "unclosed `code",
+        "[link ![image](src) inside](href)",
+        "![image](src)[link](href)",
+        "!![image](src)",
+        "[multi\nline](link)",
+    ]
+
+    def assert_same_nodes(self, text: str):
+        try:
+            expected = text_to_textnodes(text)
+        except ValueError:
+            with self.assertRaises(ValueError):
+                text_to_textnodes(text, single_pass=True)
+            with self.assertRaises(ValueError):
+                text_to_textnodes(text, spans=True)
+            return
+        self.assertListEqual(text_to_textnodes(text, single_pass=True), expected)
+        self.assertListEqual(text_to_textnodes(text, spans=True), expected)
+
+    def test_single_pass_matches_pipeline_on_corpus(self):
+        for text in self.corpus:
+            with self.subTest(text=text):
+                self.assert_same_nodes(text)
+
+    def test_single_pass_matches_pipeline_on_random_markup(self):
+        pieces = ["a", " ", "*", "**", "`", "!", "[", "]", "(", ")", "\n", "](", "!["]
+        rng = random.Random(42)
+        for _ in range(2000):
+            text = "".join(rng.choice(pieces) for _ in range(rng.randint(0, 16)))
+            with self.subTest(text=text):
+                self.assert_same_nodes(text)
+
+    def test_scan_inline_window_matches_slice(self):
+        for text in self.corpus:
+            buffer = f"> {text}\n\nafter *tail*"
+            start = 2
+            end = start + len(text)
+            with self.subTest(text=text):
+                try:
+                    expected = scan_inline(text)
+                except ValueError:
+                    with self.assertRaises(ValueError):
+                        scan_inline(buffer, start, end)
+                    continue
+                self.assertEqual(
+                    scan_inline(buffer, start, end),
+                    [
+                        (
+                            text_type,
+                            span_start + start,
+                            span_end + start,
+                            url_start + start if url_start >= 0 else -1,
+                            url_end + start if url_end >= 0 else -1,
+                        )
+                        for text_type, span_start, span_end, url_start, url_end in expected
+                    ],
+                )
+
+
 if __name__ == "__main__":
     unittest.main()
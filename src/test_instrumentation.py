@@ -0,0 +1,76 @@
+import json
+import unittest
+
+import instrumentation
+from block_markdown import markdown_to_html, render_blocks
+from instrumentation import Profiler, disable_profiler, enable_profiler
+
+
+class TestProfiler(unittest.TestCase):
+    def test_call_records_nested_stacks(self):
+        profiler = Profiler()
+
+        def inner(value: int) -> int:
+            return value + 1
+
+        def outer(value: int) -> int:
+            return profiler.call("inner", inner, value) * 2
+
+        self.assertEqual(profiler.call("outer", outer, 1), 4)
+        self.assertEqual(set(profiler.stacks), {("outer",), ("outer", "inner")})
+        outer_stats = profiler.stacks[("outer",)]
+        inner_stats = profiler.stacks[("outer", "inner")]
+        self.assertEqual(outer_stats.calls, 1)
+        self.assertAlmostEqual(
+            outer_stats.self_seconds, outer_stats.seconds - inner_stats.seconds
+        )
+
+    def test_call_records_failed_calls(self):
+        profiler = Profiler()
+
+        def fail():
+            raise ValueError("boom")
+
+        with self.assertRaises(ValueError):
+            profiler.call("fail", fail)
+        self.assertEqual(profiler.phases()["fail"].calls, 1)
+
+    def test_exports(self):
+        profiler = Profiler()
+        profiler.call("outer", profiler.call, "inner", len, "abc")
+        data = json.loads(profiler.to_json())
+        self.assertEqual(set(data["phases"]), {"outer", "inner"})
+        self.assertEqual(data["stacks"][0]["stack"], ["outer", "inner"])
+        lines = profiler.to_collapsed().splitlines()
+        self.assertEqual([line.split(" ")[0] for line in lines], ["outer", "outer;inner"])
+
+
+class TestMarkdownInstrumentation(unittest.TestCase):
+    def tearDown(self):
+        disable_profiler()
+
+    def test_disabled_by_default(self):
+        self.assertIsNone(instrumentation.profiler)
+
+    def test_markdown_phases(self):
+        profiler = enable_profiler()
+        nodes = markdown_to_html("# Title\n\nSome *text*\n\n- one\n- two")
+        render_blocks(nodes)
+        self.assertIs(disable_profiler(), profiler)
+
+        phases = profiler.phases()
+        self.assertEqual(phases["markdown_to_html"].calls, 1)
+        self.assertEqual(phases["block_to_block_type"].calls, 3)
+        self.assertEqual(phases["block_to_html[heading]"].calls, 1)
+        self.assertEqual(phases["block_to_html[unordered_list]"].calls, 1)
+        self.assertEqual(phases["text_to_textnodes"].calls, 3)
+        self.assertEqual(phases["text_nodes_to_html_nodes"].calls, 3)
+        self.assertEqual(phases["serialize"].calls, 1)
+        self.assertIn(
+            ("markdown_to_html", "block_to_html[paragraph]", "text_to_textnodes"),
+            profiler.stacks,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+
+from lazyparentnode import LazyParentNode
+from leafnode import LeafNode
+from parentnode import ParentNode
+
+
+class TestLazyParentNode(unittest.TestCase):
+    def setUp(self):
+        self.loads = 0
+
+    def load(self) -> list[LeafNode]:
+        self.loads += 1
+        return [LeafNode("lazy "), LeafNode("child", "b")]
+
+    def test_children_load_on_first_access(self):
+        node = LazyParentNode("p", self.load)
+        self.assertFalse(node.is_loaded)
+        self.assertEqual(self.loads, 0)
+        self.assertEqual(node.children, [LeafNode("lazy "), LeafNode("child", "b")])
+        node.children
+        self.assertEqual(self.loads, 1)
+        self.assertTrue(node.is_loaded)
+
+    def test_to_html_loads_children(self):
+        node = ParentNode("div", [LazyParentNode("p", self.load)])
+        self.assertEqual(node.to_html(), "<div><p>lazy <b>child</b></p></div>")
+
+    def test_equal_to_eager_parent_node(self):
+        eager = ParentNode("p", self.load())
+        self.assertEqual(LazyParentNode("p", self.load), eager)
+        self.assertEqual(eager, LazyParentNode("p", self.load))
+        self.assertNotEqual(LazyParentNode("li", self.load), eager)
+
+    def test_setting_children_drops_loader(self):
+        node = LazyParentNode("p", self.load)
+        node.children = [LeafNode("set")]
+        self.assertEqual(node.to_html(), "<p>set</p>")
+        self.assertEqual(self.loads, 0)
+
+    def test_repr_matches_parent_node(self):
+        self.assertEqual(
+            repr(LazyParentNode("p", self.load)), repr(ParentNode("p", self.load()))
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,4 @@
+import io
 import unittest
 
 from leafnode import LeafNode
@@ -26,6 +27,18 @@ class TestLeafNode(unittest.TestCase):
             '<a href="https://www.google.com" target="_blank">this is a leaf node</a>',
         )
 
+    def test_write_html(self):
+        stream = io.StringIO()
+        LeafNode("bold", "b").write_html(stream)
+        LeafNode(" and plain").write_html(stream)
+        self.assertEqual(stream.getvalue(), "<b>bold</b> and plain")
+
+    def test_write_html_without_value(self):
+        node = LeafNode("text", "p")
+        node.value = None
+        with self.assertRaises(ValueError):
+            node.write_html(io.StringIO())
+
 
 if __name__ == "__main__":
     unittest.main()
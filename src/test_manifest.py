@@ -0,0 +1,95 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from manifest import BuildManifest, ManifestEntry, hash_bytes, hash_config, hash_file
+
+
+class TestBuildManifest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        self.source = self.root / "page.md"
+        self.source.write_text("# Page")
+        self.output = self.root / "page.html"
+        self.output.write_text("<h1>Page</h1>")
+        self.dependencies = {"config": hash_config({"parser": "1"})}
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def recorded_manifest(self) -> BuildManifest:
+        manifest = BuildManifest()
+        manifest.record(
+            "page.md",
+            hash_bytes(self.source.read_bytes()),
+            "page.html",
+            self.source.stat(),
+            self.dependencies,
+        )
+        return manifest
+
+    def test_hash_file_matches_hash_bytes(self):
+        self.source.write_bytes(b"x" * 10 + b"\r\n")
+        self.assertEqual(
+            hash_file(self.source, chunk_bytes=3), hash_bytes(self.source.read_bytes())
+        )
+
+    def test_save_and_load(self):
+        manifest = self.recorded_manifest()
+        path = self.root / "manifest.json"
+        manifest.save(path)
+        self.assertEqual(BuildManifest.load(path).entries, manifest.entries)
+
+    def test_load_missing_or_corrupt(self):
+        self.assertEqual(BuildManifest.load(self.root / "missing.json").entries, {})
+        corrupt = self.root / "corrupt.json"
+        corrupt.write_text("{not json")
+        self.assertEqual(BuildManifest.load(corrupt).entries, {})
+
+    def test_is_fresh(self):
+        manifest = self.recorded_manifest()
+        stat = self.source.stat()
+        self.assertTrue(
+            manifest.is_fresh("page.md", stat, self.dependencies, self.root)
+        )
+        self.assertFalse(
+            manifest.is_fresh("page.md", stat, {"config": "other"}, self.root)
+        )
+        self.assertFalse(
+            manifest.is_fresh("other.md", stat, self.dependencies, self.root)
+        )
+        self.output.unlink()
+        self.assertFalse(
+            manifest.is_fresh("page.md", stat, self.dependencies, self.root)
+        )
+
+    def test_touched_source_matches_content(self):
+        manifest = self.recorded_manifest()
+        os.utime(self.source, ns=(0, 0))
+        self.assertFalse(
+            manifest.is_fresh(
+                "page.md", self.source.stat(), self.dependencies, self.root
+            )
+        )
+        self.assertTrue(
+            manifest.matches_content(
+                "page.md",
+                hash_bytes(self.source.read_bytes()),
+                self.dependencies,
+                self.root,
+            )
+        )
+
+    def test_remove_missing(self):
+        manifest = self.recorded_manifest()
+        self.assertEqual(manifest.remove_missing({"page.md"}), [])
+        removed = manifest.remove_missing(set())
+        self.assertEqual([entry.output for entry in removed], ["page.html"])
+        self.assertIsInstance(removed[0], ManifestEntry)
+        self.assertEqual(manifest.entries, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import hashlib
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import mapped_source
+from block_markdown import markdown_to_blocks, markdown_to_html
+from mapped_source import mapped_markdown_to_blocks, mapped_markdown_to_html
+
+
+class TestMappedSource(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.temp_dir.name) / "page.md"
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def assert_matches_text_mode(self, data: bytes):
+        self.path.write_bytes(data)
+        self.assertEqual(
+            list(mapped_markdown_to_blocks(self.path)),
+            markdown_to_blocks(self.path.read_text(encoding="utf-8")),
+        )
+
+    def test_blocks(self):
+        self.assert_matches_text_mode(
+            "# Title\n\nSome *text* here\n\n\n\n* one\n* two\n\n  café  \n".encode()
+        )
+
+    def test_empty_file(self):
+        self.assert_matches_text_mode(b"")
+        self.assertEqual(list(mapped_markdown_to_blocks(self.path)), [])
+
+    def test_whitespace_blocks(self):
+        self.assert_matches_text_mode(b"\n\n \n\n\n\n\n")
+
+    def test_carriage_returns_fall_back_to_text_mode(self):
+        self.assert_matches_text_mode(b"# Title\n\nfirst\r\n\r\nsecond\rline\n\nthird")
+        self.assert_matches_text_mode(b"a\r\n\nb\n\n\rc")
+
+    def test_releases_pages_while_reading(self):
+        markdown = "\n\n".join(f"paragraph {index} " * 200 for index in range(200))
+        with mock.patch.object(mapped_source, "RELEASE_BYTES", 4096):
+            self.assert_matches_text_mode(markdown.encode())
+
+    def test_digest_covers_every_byte(self):
+        for data in (b"# a\n\nb\n\n", b"a\n\n\n\nb", b"a\n\nb\r\nc\n\nd", b""):
+            self.path.write_bytes(data)
+            digest = hashlib.sha256()
+            with mock.patch.object(mapped_source, "RELEASE_BYTES", 2):
+                list(mapped_markdown_to_blocks(self.path, digest))
+            self.assertEqual(digest.hexdigest(), hashlib.sha256(data).hexdigest())
+
+    def test_mapped_markdown_to_html(self):
+        markdown = "## Heading\n\n> quoted **bold**\n\n1. one\n2. two"
+        self.path.write_text(markdown, encoding="utf-8")
+        self.assertEqual(
+            list(mapped_markdown_to_html(self.path)), markdown_to_html(markdown)
+        )
+
+    def test_invalid_utf8(self):
+        self.path.write_bytes(b"caf\xe9")
+        with self.assertRaises(UnicodeDecodeError):
+            list(mapped_markdown_to_blocks(self.path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import io
+import tempfile
+import unittest
+from pathlib import Path
+
+from metadata import PageMetadata, plain_text, scan_metadata, scan_metadata_file, truncate
+
+
+class TestMetadata(unittest.TestCase):
+    markdown = """## Intro
+
+# The *real* title
+
+Some **bold** words with a [link](https://boot.dev) and ![an image](cat.png).
+
+* not a summary
+* list
+
+### Details
+
+A second `paragraph`.
+"""
+
+    def test_scan_metadata(self):
+        self.assertEqual(
+            scan_metadata(self.markdown),
+            PageMetadata(
+                "The *real* title",
+                [(2, "Intro"), (1, "The *real* title"), (3, "Details")],
+                "Some bold words with a link and an image. A second paragraph.",
+            ),
+        )
+
+    def test_scan_metadata_from_lines(self):
+        self.assertEqual(
+            scan_metadata(io.StringIO(self.markdown)), scan_metadata(self.markdown)
+        )
+
+    def test_title_falls_back_to_first_heading(self):
+        self.assertEqual(scan_metadata("### Only\n\ntext").title, "Only")
+        self.assertIsNone(scan_metadata("no headings").title)
+
+    def test_summary_is_truncated(self):
+        summary = scan_metadata(self.markdown, summary_chars=20).summary
+        self.assertEqual(summary, "Some bold words with…")
+
+    def test_scan_metadata_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "page.md"
+            path.write_text(self.markdown, encoding="utf-8")
+            self.assertEqual(scan_metadata_file(path), scan_metadata(self.markdown))
+
+    def test_plain_text(self):
+        self.assertEqual(
+            plain_text("a **b**\n*c* `d` [e](f) ![g](h)"), "a b c d e g"
+        )
+
+    def test_truncate(self):
+        self.assertEqual(truncate("short", 10), "short")
+        self.assertEqual(truncate("abcdefghijkl", 5), "abcde…")
+
+
+if __name__ == "__main__":
+    unittest.main()
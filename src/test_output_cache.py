@@ -0,0 +1,67 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from output_cache import OutputCache, cache_key
+
+
+class TestOutputCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.directory = Path(self.temp_dir.name) / "cache"
+        self.cache = OutputCache(self.directory, max_bytes=10)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_cache_key_depends_on_every_input(self):
+        key = cache_key("source", {"config": "a", "template": "t"})
+        self.assertEqual(key, cache_key("source", {"template": "t", "config": "a"}))
+        self.assertNotEqual(key, cache_key("other", {"config": "a", "template": "t"}))
+        self.assertNotEqual(key, cache_key("source", {"config": "b", "template": "t"}))
+        self.assertNotEqual(key, cache_key("source", {"config": "a"}))
+
+    def test_get_and_put(self):
+        key = cache_key("source", {})
+        self.assertIsNone(self.cache.get(key))
+        self.cache.put(key, b"<p>hi</p>")
+        self.assertEqual(self.cache.get(key), b"<p>hi</p>")
+        self.assertEqual(
+            {name: self.cache.stats()[name] for name in ("hits", "misses", "added")},
+            {"hits": 1, "misses": 1, "added": 1},
+        )
+
+    def test_put_file(self):
+        key = cache_key("source", {})
+        source = Path(self.temp_dir.name) / "page.html"
+        source.write_bytes(b"<p>big</p>")
+        self.cache.put_file(key, source)
+        self.assertEqual(self.cache.get(key), b"<p>big</p>")
+        self.assertTrue(source.exists())
+
+    def test_stats_of_missing_directory(self):
+        stats = self.cache.stats()
+        self.assertEqual((stats["entries"], stats["bytes"]), (0, 0))
+
+    def test_prune_evicts_least_recently_used(self):
+        for index, name in enumerate(("a", "b", "c")):
+            key = cache_key(name, {})
+            self.cache.put(key, b"12345")
+            os.utime(self.cache.path_for(key), ns=(0, index * 1_000_000_000))
+        # Reading an entry makes it the most recently used one.
+        self.cache.get(cache_key("a", {}))
+        result = self.cache.prune()
+        self.assertEqual((result.removed, result.freed), (1, 5))
+        self.assertIsNone(self.cache.get(cache_key("b", {})))
+        self.assertIsNotNone(self.cache.get(cache_key("a", {})))
+        self.assertIsNotNone(self.cache.get(cache_key("c", {})))
+
+    def test_prune_to_explicit_size(self):
+        self.cache.put(cache_key("a", {}), b"12345")
+        self.assertEqual(self.cache.prune(max_bytes=0).removed, 1)
+        self.assertEqual(self.cache.stats()["entries"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
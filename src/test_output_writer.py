@@ -0,0 +1,121 @@
+import os
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import output_writer
+from output_writer import (
+    OutputWriter,
+    replace_if_changed,
+    write_atomic,
+    write_if_changed,
+)
+
+
+class TestWriteIfChanged(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_write_atomic_creates_parents(self):
+        target = self.root / "a" / "b.html"
+        write_atomic(target, b"<p>hi</p>")
+        self.assertEqual(target.read_bytes(), b"<p>hi</p>")
+        self.assertEqual(os.listdir(target.parent), ["b.html"])
+
+    def test_identical_bytes_keep_mtime(self):
+        target = self.root / "page.html"
+        self.assertTrue(write_if_changed(target, b"same"))
+        os.utime(target, ns=(0, 1_000_000_000))
+        self.assertFalse(write_if_changed(target, b"same"))
+        self.assertEqual(target.stat().st_mtime_ns, 1_000_000_000)
+
+    def test_changed_bytes_are_written(self):
+        target = self.root / "page.html"
+        write_if_changed(target, b"old!")
+        self.assertTrue(write_if_changed(target, b"new!"))
+        self.assertEqual(target.read_bytes(), b"new!")
+
+    def test_replace_if_changed_consumes_the_rendered_file(self):
+        target = self.root / "blog" / "page.html"
+        rendered = self.root / ".page.spool"
+        rendered.write_bytes(b"same")
+        self.assertTrue(replace_if_changed(target, rendered))
+        os.utime(target, ns=(0, 1_000_000_000))
+        rendered.write_bytes(b"same")
+        self.assertFalse(replace_if_changed(target, rendered))
+        self.assertEqual(target.stat().st_mtime_ns, 1_000_000_000)
+        self.assertFalse(rendered.exists())
+        rendered.write_bytes(b"new!")
+        self.assertTrue(replace_if_changed(target, rendered))
+        self.assertEqual((target.read_bytes(), rendered.exists()), (b"new!", False))
+
+
+class TestOutputWriter(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_writes_pages(self):
+        with OutputWriter(workers=3, max_pending=2) as writer:
+            for index in range(50):
+                writer.submit(self.root / f"{index}.html", f"<p>{index}</p>".encode())
+        self.assertEqual((writer.written, writer.identical), (50, 0))
+        self.assertEqual((self.root / "7.html").read_bytes(), b"<p>7</p>")
+
+    def test_counts_identical_pages(self):
+        write_atomic(self.root / "same.html", b"same")
+        with OutputWriter() as writer:
+            writer.submit(self.root / "same.html", b"same")
+            writer.submit(self.root / "new.html", b"new")
+        self.assertEqual((writer.written, writer.identical), (1, 1))
+
+    def test_backpressure_bounds_pending_writes(self):
+        release = threading.Event()
+        started = threading.Semaphore(0)
+
+        def slow_write(target: Path, data: bytes) -> bool:
+            started.release()
+            release.wait()
+            return True
+
+        with mock.patch.object(output_writer, "write_if_changed", slow_write):
+            writer = OutputWriter(workers=1, max_pending=2)
+            writer.submit(self.root / "a.html", b"a")
+            writer.submit(self.root / "b.html", b"b")
+            blocked = threading.Thread(
+                target=writer.submit, args=(self.root / "c.html", b"c")
+            )
+            blocked.start()
+            started.acquire()
+            blocked.join(0.05)
+            self.assertTrue(blocked.is_alive())
+            release.set()
+            blocked.join()
+            writer.close()
+        self.assertEqual(writer.written, 3)
+
+    def test_close_raises_write_errors(self):
+        (self.root / "file").write_bytes(b"")
+        writer = OutputWriter()
+        writer.submit(self.root / "file" / "page.html", b"x")
+        with self.assertRaises(OSError):
+            writer.close()
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            OutputWriter(workers=0)
+        with self.assertRaises(ValueError):
+            OutputWriter(max_pending=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+
+from leafnode import LeafNode
+from page_report import PageStats, count_nodes, find_slow_pages, format_page_report
+from parentnode import ParentNode
+
+
+def page(name: str, seconds: float, source_chars: int) -> PageStats:
+    return PageStats(name, seconds, 0.0, 1, 1, source_chars, source_chars)
+
+
+class TestPageReport(unittest.TestCase):
+    def test_count_nodes(self):
+        nodes = [
+            LeafNode("heading", "h1"),
+            ParentNode("ul", [ParentNode("li", [LeafNode("a"), LeafNode("b", "b")])]),
+        ]
+        self.assertEqual(count_nodes(nodes), 5)
+
+    def test_find_slow_pages_over_threshold(self):
+        pages = [page("fast.md", 0.01, 1000), page("slow.md", 2.0, 200_000)]
+        slow = find_slow_pages(pages, threshold_seconds=1.0)
+        self.assertEqual([item.stats.page for item in slow], ["slow.md"])
+        self.assertIn("threshold", slow[0].reason)
+
+    def test_find_slow_pages_superlinear(self):
+        pages = [
+            page("a.md", 0.010, 10_000),
+            page("b.md", 0.020, 20_000),
+            page("c.md", 0.040, 40_000),
+            page("pathological.md", 0.200, 20_000),
+        ]
+        slow = find_slow_pages(pages, threshold_seconds=1.0)
+        self.assertEqual([item.stats.page for item in slow], ["pathological.md"])
+        self.assertIn("median time per character", slow[0].reason)
+
+    def test_find_slow_pages_ignores_tiny_pages(self):
+        pages = [page("a.md", 0.0001, 1000), page("b.md", 0.0001, 1000)]
+        pages.append(page("tiny.md", 0.001, 10))
+        self.assertEqual(find_slow_pages(pages, threshold_seconds=1.0), [])
+
+    def test_format_page_report(self):
+        pages = [page("fast.md", 0.001, 10), page("slow.md", 0.5, 10)]
+        lines = format_page_report(pages, top=1).splitlines()
+        self.assertEqual(lines[0], "slowest 1 of 2 pages:")
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(lines[2].endswith("slow.md"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,5 @@
+import io
+import sys
 import unittest
 
 from parentnode import ParentNode
@@ -52,6 +54,51 @@ class TestParentNode(unittest.TestCase):
             '<h1><h2><a href="https://www.google.com" target="_blank">this is a leaf node</a></h2></h1>',
         )
 
+    def test_write_html_nested(self):
+        node = ParentNode(
+            "ul",
+            [
+                ParentNode("li", [LeafNode("first")]),
+                ParentNode("li", [LeafNode("second", "b"), LeafNode(" item")]),
+            ],
+        )
+        stream = io.StringIO()
+        node.write_html(stream)
+        self.assertEqual(
+            stream.getvalue(),
+            "<ul><li>first</li><li><b>second</b> item</li></ul>",
+        )
+        self.assertEqual(node.to_html(), stream.getvalue())
+
+    def test_write_html_without_children(self):
+        node = ParentNode("p", [])
+        node.children = None
+        with self.assertRaises(ValueError):
+            node.write_html(io.StringIO())
+
+    def test_write_html_nested_without_children(self):
+        child = ParentNode("li", [])
+        child.children = None
+        with self.assertRaises(ValueError):
+            ParentNode("ul", [child]).to_html()
+
+    def test_write_html_beyond_recursion_limit(self):
+        depth = sys.getrecursionlimit() * 3
+        node = LeafNode("deep")
+        for _ in range(depth):
+            node = ParentNode("li", [LeafNode("x"), node])
+        self.assertEqual(
+            node.to_html(), "<li>x" * depth + "deep" + "</li>" * depth
+        )
+
+    def test_write_html_uses_overridden_serializers(self):
+        class Placeholder(ParentNode):
+            def write_html(self, stream):
+                stream.write("[placeholder]")
+
+        node = ParentNode("p", [LeafNode("a"), Placeholder("div", [LeafNode("b")])])
+        self.assertEqual(node.to_html(), "<p>a[placeholder]</p>")
+
 
 if __name__ == "__main__":
     unittest.main()
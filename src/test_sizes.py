@@ -0,0 +1,15 @@
+import unittest
+
+from sizes import parse_size
+
+
+class TestSizes(unittest.TestCase):
+    def test_parse_size(self):
+        self.assertEqual(parse_size("1KB"), 1024)
+        self.assertEqual(parse_size("100mb"), 100 * 1024**2)
+        self.assertEqual(parse_size("512"), 512)
+        self.assertEqual(parse_size(" 1.5 gb "), int(1.5 * 1024**3))
+
+
+if __name__ == "__main__":
+    unittest.main()
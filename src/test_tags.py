@@ -0,0 +1,41 @@
+import unittest
+
+from leafnode import LeafNode
+from parentnode import ParentNode
+from tags import DEFAULT_TAGS, TagFragments, register_tag, tag_fragments
+
+
+class TestTags(unittest.TestCase):
+    def test_default_tags_are_registered(self):
+        for tag in DEFAULT_TAGS:
+            self.assertIn(tag, tag_fragments)
+        self.assertEqual(tag_fragments["h3"], TagFragments("<h3>", "<h3", "</h3>"))
+
+    def test_register_tag(self):
+        fragments = register_tag("kbd")
+        try:
+            self.assertEqual(fragments, TagFragments("<kbd>", "<kbd", "</kbd>"))
+            self.assertIs(register_tag("kbd"), fragments)
+            self.assertEqual(LeafNode("Ctrl", "kbd").to_html(), "<kbd>Ctrl</kbd>")
+        finally:
+            del tag_fragments["kbd"]
+
+    def test_unregistered_tags_are_formatted(self):
+        self.assertNotIn("mark", tag_fragments)
+        self.assertEqual(LeafNode("hi", "mark").to_html(), "<mark>hi</mark>")
+        self.assertEqual(
+            ParentNode("section", [LeafNode("hi", "mark")], {"id": "x"}).to_html(),
+            '<section id="x"><mark>hi</mark></section>',
+        )
+
+    def test_registered_tags_with_props(self):
+        node = ParentNode("ol", [LeafNode("one", "li")], {"start": "3"})
+        self.assertEqual(node.to_html(), '<ol start="3"><li>one</li></ol>')
+        self.assertEqual(
+            LeafNode("", "img", {"src": "a.png", "alt": ""}).to_html(),
+            '<img src="a.png" alt=""></img>',
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
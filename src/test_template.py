@@ -0,0 +1,84 @@
+import pickle
+import tempfile
+import unittest
+from pathlib import Path
+
+from template import Template, load_template, template_cache
+
+
+class TestTemplate(unittest.TestCase):
+    def test_render(self):
+        template = Template("<title>{{ title }}</title><main>{{content}}</main>")
+        self.assertEqual(
+            template.render({"title": "Home", "content": "<p>hi</p>"}),
+            "<title>Home</title><main><p>hi</p></main>",
+        )
+
+    def test_placeholders(self):
+        template = Template("{{ title }} {{ content }} {{ title }}")
+        self.assertEqual(template.placeholders, {"title", "content"})
+
+    def test_render_without_placeholders(self):
+        self.assertEqual(Template("<hr>").render({}), "<hr>")
+
+    def test_render_does_not_reinterpret_values(self):
+        template = Template("{{ content }}")
+        self.assertEqual(
+            template.render({"content": "{{ title }}"}), "{{ title }}"
+        )
+
+    def test_render_missing_value(self):
+        with self.assertRaises(ValueError):
+            Template("{{ title }}").render({})
+
+    def test_render_around(self):
+        template = Template("<title>{{ title }}</title>{{ content }}<hr>{{content}}.")
+        self.assertEqual(
+            template.render_around("content", {"title": "Home"}),
+            ["<title>Home</title>", "<hr>", "."],
+        )
+        self.assertEqual(
+            Template("{{ title }}").render_around("content", {"title": "x"}), ["x"]
+        )
+        with self.assertRaises(ValueError):
+            template.render_around("content", {})
+
+    def test_template_pickles_compiled(self):
+        template = Template("a{{ content }}b")
+        copy = pickle.loads(pickle.dumps(template))
+        self.assertEqual(copy, template)
+        self.assertEqual(copy.render({"content": "-"}), "a-b")
+
+
+class TestLoadTemplate(unittest.TestCase):
+    def setUp(self):
+        template_cache.clear()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.temp_dir.name) / "layout.html"
+        self.path.write_text("<main>{{ content }}</main>", encoding="utf-8")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_load_template_is_cached(self):
+        self.assertIs(load_template(self.path), load_template(self.path))
+
+    def test_load_template_reloads_changed_file(self):
+        first = load_template(self.path)
+        self.path.write_text("<div>{{ content }}</div>", encoding="utf-8")
+        self.assertEqual(
+            load_template(self.path).render({"content": "x"}), "<div>x</div>"
+        )
+        self.assertNotEqual(load_template(self.path), first)
+        self.assertEqual(len(template_cache), 1)
+
+    def test_load_template_checks_fields(self):
+        self.path.write_text("{{ nav }}{{ content }}{{ footer }}", encoding="utf-8")
+        template = load_template(self.path, ["nav", "content", "footer"])
+        self.assertEqual(template.placeholders, {"nav", "content", "footer"})
+        with self.assertRaisesRegex(ValueError, "footer, nav"):
+            load_template(self.path, ["title", "content"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,7 @@
 import unittest
 
-from textnode import TextNode, TextType, text_node_to_html_node
+from leafnode import LeafNode
+from textnode import TextNode, TextSpan, TextType, text_node_to_html_node
 
 
 class TestTextNode(unittest.TestCase):
@@ -24,6 +25,10 @@ class TestTextNode(unittest.TestCase):
         node2 = TextNode("This is a text node", TextType.BOLD, "yahoo.com")
         self.assertNotEqual(node, node2)
 
+    def test_has_no_instance_dict(self):
+        node = TextNode("This is a text node", TextType.BOLD)
+        self.assertFalse(hasattr(node, "__dict__"))
+
     def test_correct_repr(self):
         node = TextNode("This is a text node", TextType.BOLD)
         self.assertEqual(f"{node}", "TextNode(This is a text node, bold, None)")
@@ -75,5 +80,52 @@ class TestTextNode(unittest.TestCase):
         )
 
 
+class TestTextSpan(unittest.TestCase):
+    source = "see [the docs](https://boot.dev) **now**"
+
+    def test_span_reads_from_source(self):
+        span = TextSpan(self.source, 5, 13, TextType.LINK, 15, 31)
+        self.assertEqual(span.text, "the docs")
+        self.assertEqual(span.url, "https://boot.dev")
+        self.assertIs(span.source, self.source)
+        self.assertIsNone(TextSpan(self.source, 0, 4, TextType.TEXT).url)
+
+    def test_span_equals_copied_node(self):
+        span = TextSpan(self.source, 35, 38, TextType.BOLD)
+        node = TextNode("now", TextType.BOLD)
+        self.assertEqual(span, node)
+        self.assertEqual(node, span)
+        self.assertNotEqual(span, TextNode("now", TextType.ITALIC))
+
+    def test_span_repr(self):
+        span = TextSpan(self.source, 5, 13, TextType.LINK, 15, 31)
+        self.assertEqual(f"{span}", "TextNode(the docs, link, https://boot.dev)")
+
+    def test_span_fields_can_be_assigned(self):
+        span = TextSpan(self.source, 5, 13, TextType.LINK, 15, 31)
+        span.text = "docs"
+        self.assertEqual((span.text, span.url), ("docs", "https://boot.dev"))
+        span.url = "/docs"
+        self.assertEqual(span, TextNode("docs", TextType.LINK, "/docs"))
+        span.url = None
+        self.assertEqual((span.text, span.url), ("docs", None))
+        span.text_type = TextType.BOLD.value
+        self.assertEqual(span, TextNode("docs", TextType.BOLD))
+
+    def test_span_is_not_a_text_node(self):
+        span = TextSpan(self.source, 0, 3, TextType.TEXT)
+        self.assertNotIsInstance(span, TextNode)
+
+    def test_span_has_no_instance_dict(self):
+        self.assertFalse(hasattr(TextSpan(self.source, 0, 3, TextType.TEXT), "__dict__"))
+
+    def test_span_to_html_node(self):
+        span = TextSpan(self.source, 5, 13, TextType.LINK, 15, 31)
+        self.assertEqual(
+            text_node_to_html_node(span),
+            LeafNode("the docs", "a", {"href": "https://boot.dev"}),
+        )
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,5 +1,5 @@
 from enum import Enum
-from typing_extensions import Optional
+from typing_extensions import Optional, Sequence
 from leafnode import LeafNode
 
 
@@ -13,13 +13,77 @@ class TextType(Enum):
 
 
 class TextNode:
+    __slots__ = ("text", "text_type", "url")
+
     def __init__(self, text: str, text_type: TextType, url: Optional[str] = None):
         self.text = text
         self.text_type = text_type.value
         self.url = url
 
     def __eq__(self, other: object) -> bool:
-        if not isinstance(other, type(self)):
+        # Spans compare equal to the copied nodes they stand in for.
+        if not isinstance(other, (TextNode, TextSpan)):
+            return False
+        return (
+            self.text == other.text
+            and self.text_type == other.text_type
+            and self.url == other.url
+        )
+
+    def __repr__(self) -> str:
+        return f"TextNode({self.text}, {self.text_type}, {self.url})"
+
+
+class TextSpan:
+    # Follows the TextNode interface without subclassing it, so a span only
+    # carries its own slots.
+    __slots__ = ("source", "start", "end", "text_type", "url_start", "url_end")
+
+    def __init__(
+        self,
+        source: str,
+        start: int,
+        end: int,
+        text_type: TextType,
+        url_start: int = -1,
+        url_end: int = -1,
+    ):
+        # The text and url are offsets into source and only sliced out when
+        # read, so scanning a block copies none of it.
+        self.source = source
+        self.start = start
+        self.end = end
+        self.text_type = text_type.value
+        self.url_start = url_start
+        self.url_end = url_end
+
+    @property
+    def text(self) -> str:
+        return self.source[self.start : self.end]
+
+    @text.setter
+    def text(self, text: str):
+        self._point_at(text, self.url)
+
+    @property
+    def url(self) -> Optional[str]:
+        if self.url_start < 0:
+            return None
+        return self.source[self.url_start : self.url_end]
+
+    @url.setter
+    def url(self, url: Optional[str]):
+        self._point_at(self.text, url)
+
+    def _point_at(self, text: str, url: Optional[str]):
+        # Assigned values get a source of their own instead of the block's.
+        self.source = text if url is None else text + url
+        self.start, self.end = 0, len(text)
+        self.url_start = -1 if url is None else len(text)
+        self.url_end = len(self.source) if url is not None else -1
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, (TextNode, TextSpan)):
             return False
         return (
             self.text == other.text
@@ -28,14 +92,17 @@ class TextNode:
         )
 
     def __repr__(self) -> str:
+        # Spans print like the TextNodes they stand in for.
         return f"TextNode({self.text}, {self.text_type}, {self.url})"
 
 
-def text_nodes_to_html_nodes(text_nodes: list[TextNode]) -> list[LeafNode]:
+def text_nodes_to_html_nodes(
+    text_nodes: Sequence[TextNode | TextSpan],
+) -> list[LeafNode]:
     return [text_node_to_html_node(text_node) for text_node in text_nodes]
 
 
-def text_node_to_html_node(text_node: TextNode) -> LeafNode:
+def text_node_to_html_node(text_node: TextNode | TextSpan) -> LeafNode:
     if text_node.text_type == TextType.TEXT.value:
         return LeafNode(text_node.text)
     if text_node.text_type == TextType.BOLD.value: